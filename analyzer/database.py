@@ -38,27 +38,40 @@ def get_db_connection():
     return conn
 
 
-def load_processed_articles(model):
+def load_unprocessed_articles(model, max_priority, conn=None):
     """
-    @brief Loads IDs of articles already processed by a specific model.
+    @brief Loads articles which haven't been processed by a specific model yet.
+
+    Filtering is done by the database (using idx_analysis_article_model), so already
+    processed articles are never loaded.
 
     @param model Name of the LLM model to check for processed articles
-    @return Set of article IDs that have already been processed by the given model
+    @param max_priority Articles with higher priority are skipped
+    @param conn Optional open connection to reuse, a new one is opened (and closed) if not given
+    @return List of article rows ordered by priority
     """
-    conn = get_db_connection()
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
     cursor = conn.cursor()
 
     cursor.execute(
         """
-        SELECT article_id FROM analysis WHERE model_name = ?
-    """,
-        (model,),
+        SELECT a.* FROM articles AS a
+        WHERE a.priority <= ?
+            AND NOT EXISTS (
+                SELECT 1 FROM analysis AS an
+                WHERE an.article_id = a.id AND an.model_name = ?
+            )
+        ORDER BY a.priority ASC
+        """,
+        (max_priority, model),
     )
-    processed_articles = cursor.fetchall()
-    processed_article_ids = {row["article_id"] for row in processed_articles}
+    articles = cursor.fetchall()
 
-    conn.close()
-    return processed_article_ids
+    if own_conn:
+        conn.close()
+    return articles
 
 
 def get_last_trading_day(date_str):
@@ -9,9 +9,9 @@ individual article analysis and aggregated stock analysis.
 import json
 import google.generativeai as genai
 import config
-import re
 
-from database import fetch_sum_analysis_data, increment_priority, get_db_connection
+from utils import RESPONSE_PATTERN
+from database import fetch_sum_analysis_data, increment_priority
 from google.api_core import exceptions
 
 
@@ -43,17 +43,17 @@ def process_article_google(entry, model):
 
     response_text = response.text
 
-    if "ERROR-01" in response_text:
+    match = RESPONSE_PATTERN.match(response_text)
+    if match and match.group("error"):
         print(f" | FAILED, couldn't determine relevant stock for article")
         increment_priority(entry["id"])
         return None
 
-    match = re.search(r"\{(.*?)\}", response_text, re.DOTALL)
     if not match:
         print(f" | FAILED, couldn't find proper JSON in response")
         return None
 
-    extracted_content = "{" + match.group(1) + "}"
+    extracted_content = "{" + match.group("json") + "}"
 
     try:
         data = json.loads(extracted_content)
@@ -96,25 +96,16 @@ def process_article_google_sum(model_name, prompt):
 
     response_text = response.text
 
-    if "ERROR-01" in response_text:
-        print(f" | FAILED, couldn't determine relevant stock for article")
-        increment_priority(article["id"])
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE articles SET priority = priority + 1 WHERE id = ?",
-            (article["id"],),
-        )
-        conn.commit()
-        conn.close()
+    match = RESPONSE_PATTERN.match(response_text)
+    if match and match.group("error"):
+        print(f" | FAILED, couldn't determine relevant stock for summary")
         return None
 
-    match = re.search(r"\{(.*?)\}", response_text, re.DOTALL)
     if not match:
         print(f" | FAILED, couldn't find proper JSON in response")
         return None
 
-    extracted_content = "{" + match.group(1) + "}"
+    extracted_content = "{" + match.group("json") + "}"
 
     try:
         data = json.loads(extracted_content)
@@ -8,9 +8,9 @@ article analysis and aggregated stock analysis.
 
 import json
 import config
-import re
 
-from database import fetch_sum_analysis_data, increment_priority, get_db_connection
+from utils import RESPONSE_PATTERN
+from database import fetch_sum_analysis_data, increment_priority
 from groq import Groq, RateLimitError, APIStatusError
 
 
@@ -45,25 +45,17 @@ def process_article_groq(article, model):
 
     response_text = chat_completion.choices[0].message.content
 
-    if "ERROR-01" in response_text:
+    match = RESPONSE_PATTERN.match(response_text)
+    if match and match.group("error"):
         print(f" | FAILED, couldn't determine relevant stock for article")
         increment_priority(article["id"])
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE articles SET priority = priority + 1 WHERE id = ?",
-            (article["id"],),
-        )
-        conn.commit()
-        conn.close()
         return None
 
-    match = re.search(r"\{(.*?)\}", response_text, re.DOTALL)
     if not match:
         print(f" | FAILED, couldn't find proper JSON in response")
         return None
 
-    extracted_content = "{" + match.group(1) + "}"
+    extracted_content = "{" + match.group("json") + "}"
 
     try:
         data = json.loads(extracted_content)
@@ -109,16 +101,16 @@ def processed_article_groq_sum(model, prompt):
         print(f" | FAILED, Unexpected error: {e}")
         return None
 
-    if "ERROR-01" in response_text:
+    match = RESPONSE_PATTERN.match(response_text)
+    if match and match.group("error"):
         print(f" | FAILED, couldn't determine relevant stock for summary")
         return None
 
-    match = re.search(r"\{(.*?)\}", response_text, re.DOTALL)
     if not match:
         print(f" | FAILED, couldn't find proper JSON in response")
         return None
 
-    extracted_content = "{" + match.group(1) + "}"
+    extracted_content = "{" + match.group("json") + "}"
 
     try:
         data = json.loads(extracted_content)
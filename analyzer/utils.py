@@ -9,6 +9,29 @@ string formatting, data validation, and project path management.
 import re
 from pathlib import Path
 
+# Matches an LLM response in a single pass, group "error" is set if the response contains
+# ERROR-01 anywhere, otherwise group "json" holds the content of the first {...} block
+RESPONSE_PATTERN = re.compile(r".*?(?P<error>ERROR-01)|.*?\{(?P<json>.*?)\}", re.DOTALL)
+
+# Number of days predicted by the LLM
+PREDICTION_DAYS = 7
+
+# Pairs of prediction and confidence keys for each predicted day
+PREDICTION_KEYS = tuple(
+    (f"prediction_{i}_day", f"confidence_{i}_day")
+    for i in range(1, PREDICTION_DAYS + 1)
+)
+
+# Keys every analysis returned by LLM has to contain
+REQUIRED_KEYS = frozenset(
+    ["stock", "ticker", "summary"] + [key for pair in PREDICTION_KEYS for key in pair]
+)
+
+# Values of stock or ticker (lowercased) meaning LLM couldn't determine them
+INVALID_STRINGS = frozenset(
+    ["", "none", "unknown", "null", "n/a", "error", "not available"]
+)
+
 
 def shorten_string(string, max_length=60):
     """
@@ -54,46 +77,15 @@ def is_valid_data(data):
     @return True if the data is valid, False otherwise.
     """
     try:
-        required_keys = [
-            "stock",
-            "ticker",
-            "summary",
-            "prediction_1_day",
-            "prediction_2_day",
-            "prediction_3_day",
-            "prediction_4_day",
-            "prediction_5_day",
-            "prediction_6_day",
-            "prediction_7_day",
-            "confidence_1_day",
-            "confidence_2_day",
-            "confidence_3_day",
-            "confidence_4_day",
-            "confidence_5_day",
-            "confidence_6_day",
-            "confidence_7_day",
-        ]
-
-        for key in required_keys:
-            if key not in data:
-                return False
+        if not REQUIRED_KEYS <= data.keys():
+            return False
 
-        invalid_strings = {
-            "",
-            "none",
-            "unknown",
-            "null",
-            "n/a",
-            "error",
-            "not available",
-        }
-        if str(data["stock"]).strip().lower() in invalid_strings:
+        if str(data["stock"]).strip().lower() in INVALID_STRINGS:
             return False
-        if str(data["ticker"]).strip().lower() in invalid_strings:
+        if str(data["ticker"]).strip().lower() in INVALID_STRINGS:
             return False
 
-        for i in range(1, 8):
-            prediction_key = f"prediction_{i}_day"
+        for prediction_key, confidence_key in PREDICTION_KEYS:
             try:
                 prediction_value = float(data[prediction_key])
             except (ValueError, TypeError):
@@ -102,7 +94,6 @@ def is_valid_data(data):
             if not (-1.0 <= prediction_value <= 1.0):
                 return False
 
-            confidence_key = f"confidence_{i}_day"
             try:
                 confidence_value = float(data[confidence_key])
             except (ValueError, TypeError):
@@ -125,12 +116,11 @@ def get_project_root():
     Searches for a .git directory in parent directories to identify the project root.
 
     @return Path to the project root directory.
-    @throws SystemExit if the root directory cannot be found.
+    @throws FileNotFoundError if the root directory cannot be found.
     """
     marker = ".git"
     current_path = Path(__file__).resolve()
     for parent in current_path.parents:
         if (parent / marker).exists():
             return parent
-    print("ERROR: Failed to find root folder of project")
-    exit(1)
+    raise FileNotFoundError("Failed to find root folder of project")
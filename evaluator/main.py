@@ -8,57 +8,133 @@
          - Detailed CSV tables of metrics
 """
 
-import json
+import orjson
+import ijson
+import functools
+import mmap
 import os
-import glob
-import csv
+import pickle
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import pandas as pd
+import matplotlib
+
+# Graphs are only saved to files, non-interactive backend avoids GUI toolkit setup
+matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
 import argparse
 from matplotlib.ticker import MaxNLocator
 
+# Simplify paths before drawing and compress PDF streams
+plt.rcParams.update(
+    {
+        "path.simplify": True,
+        "path.simplify_threshold": 1.0,
+        "agg.path.chunksize": 10000,
+        "pdf.compression": 9,
+    }
+)
+
+# Graph file formats saved by default, each format means one more rendering of a graph
+GRAPH_FORMATS = ("png", "pdf")
+
+# Files larger than this (in bytes) are parsed incrementally article by article
+STREAM_PARSE_SIZE = 32 * 1024 * 1024
+
+# Process pool saving graph files in background (created on first saved graph) and
+# results of its pending saves
+graph_executor = None
+pending_graphs = []
+
+# Columns of prediction error records, one record per evaluated prediction
+RECORD_COLUMNS = ["model", "source", "ticker", "day", "error"]
+
+# Columns of interaction records, these include predictions of any day (and articles
+# without source) with nonzero real and predicted value
+INTERACTION_COLUMNS = ["model", "source", "ticker", "error"]
+
+# Group key columns repeat few distinct strings, categories store them as small integer
+# codes which are also faster to group by than hashing strings
+KEY_DTYPES = {"model": "category", "source": "category", "ticker": "category"}
+
+# Errors are stored in single precision, halves memory of records (and their cache)
+ERROR_DTYPE = np.float32
 
-def load_data(data_dir, max_day=12, min_articles_per_source=1):
+# Records of already processed files are cached in the data directory, manifest keeps
+# modification time and valid articles of every cached file
+CACHE_FILE = ".predictions_cache.parquet"
+INTERACTION_CACHE_FILE = ".interactions_cache.parquet"
+MANIFEST_FILE = ".predictions_cache.json"
+
+# Has to be increased whenever the content of records changes, invalidates old caches
+CACHE_VERSION = 4
+
+
+def stream_articles(file_path):
     """
-    @brief Load and process prediction data from JSON files
-    @param data_dir Directory containing JSON prediction files
-    @param max_day Maximum prediction day to include in analysis
-    @param min_articles_per_source Minimum articles required per source
-    @return Dictionary containing processed metrics
+    @brief Incrementally parse articles of JSON prediction file
+    @param file_path Path to JSON prediction file
+    @return Generator of article dictionaries
     """
-    print(f"Processing JSON files in {data_dir}...")
+    with open(file_path, "rb") as f:
+        yield from ijson.items(f, "predictionsByArticle.item", use_float=True)
 
-    day_metrics = defaultdict(lambda: {"errors": [], "count": 0})
-    model_day_metrics = defaultdict(lambda: defaultdict(list))
-    source_day_metrics = defaultdict(lambda: defaultdict(list))
-    model_counts = defaultdict(lambda: defaultdict(int))
-    source_counts = defaultdict(lambda: defaultdict(int))
-    model_overall = defaultdict(list)
-    source_overall = defaultdict(list)
-    ticker_metrics = defaultdict(lambda: defaultdict(list))
-    source_article_counts = defaultdict(int)
-    source_valid_articles = defaultdict(set)
 
-    file_paths = glob.glob(os.path.join(data_dir, "*.json"))
-    print(f"Found {len(file_paths)} JSON files")
+def load_prediction_file(file_path):
+    """
+    @brief Load model name and articles of JSON prediction file
+    @details Smaller files are decoded directly from memory mapped file without copying
+             it into bytes first. Files larger than STREAM_PARSE_SIZE (and empty files,
+             which cannot be mapped) are not decoded at once, their articles are streamed
+             one at a time to keep memory of worker processes low
+    @param file_path Path to JSON prediction file
+    @return Tuple of model name and iterable of article dictionaries
+    """
+    if 0 < os.path.getsize(file_path) <= STREAM_PARSE_SIZE:
+        with open(file_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as file_map, memoryview(file_map) as buffer:
+            data = orjson.loads(buffer)
+        return data.get("model"), data.get("predictionsByArticle", [])
 
-    for file_path in file_paths:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Skipping {os.path.basename(file_path)}: {str(e)}")
-            continue
+    with open(file_path, "rb") as f:
+        model = next(ijson.items(f, "model"), None)
+    return model, stream_articles(file_path)
 
-        model = data.get("model")
 
-        ticker = os.path.basename(file_path).split("_")[0]
-        predictions_by_article = data.get("predictionsByArticle", [])
+def process_file(file_path):
+    """
+    @brief Load single JSON prediction file and compute percentage errors of its predictions
+    @param file_path Path to JSON prediction file
+    @return None for unreadable or empty files, otherwise dictionary with DataFrames of
+            prediction error records and interaction records of the file and dates of
+            valid articles per source
+    """
+    try:
+        model, predictions_by_article = load_prediction_file(file_path)
+    except (orjson.JSONDecodeError, ijson.JSONError, IOError) as e:
+        print(f"Warning: Skipping {os.path.basename(file_path)}: {str(e)}")
+        return None
 
-        if not model or not predictions_by_article:
-            continue
+    ticker = os.path.basename(file_path).split("_")[0]
 
+    if not model or not predictions_by_article:
+        return None
+
+    valid_articles = defaultdict(set)
+
+    # Raw values of all predictions in the file, errors are computed at once below
+    source_ids = {}
+    predicted_values = []
+    real_values = []
+    prediction_days = []
+    prediction_sources = []
+    interactions = []
+
+    # Streamed files are only decoded while iterating over their articles
+    try:
         for article_data in predictions_by_article:
             source = article_data.get("source")
             article_date = article_data.get(
@@ -66,96 +142,390 @@ def load_data(data_dir, max_day=12, min_articles_per_source=1):
             )  # Using date as article identifier
             predictions = article_data.get("predictions", {})
 
-            if not source or not predictions:
+            if not predictions:
                 continue
 
-            # Check if article has at least one valid prediction with real data
-            has_valid_prediction = any(
-                day_pred.get("real") is not None for day_pred in predictions.values()
-            )
+            if source:
+                source_id = source_ids.setdefault(source, len(source_ids))
 
-            if has_valid_prediction:
-                # Use source + article_date as unique article identifier
-                article_id = f"{source}_{article_date}"
-                source_valid_articles[source].add(article_id)
+            # Single pass over the predictions, checks are ordered by how often they
+            # reject (real values are missing for all days which have not passed yet)
+            has_valid_prediction = False
+            for values in predictions.values():
+                real = values.get("real")
+                if real is None:
+                    continue
+                has_valid_prediction = True
 
-            for date, values in predictions.items():
                 prediction = values.get("prediction")
-                real = values.get("real")
+                if prediction is None:
+                    continue
+
+                if real and prediction:
+                    interactions.append((source, prediction, real))
+
                 day = values.get("predictionDay")
+                if not source or day is None:
+                    continue
+
+                predicted_values.append(prediction)
+                real_values.append(real)
+                prediction_days.append(day)
+                prediction_sources.append(source_id)
+
+            if source and has_valid_prediction:
+                # Article is identified by its date within its source
+                valid_articles[source].add(article_date)
+    except ijson.JSONError as e:
+        print(f"Warning: Skipping {os.path.basename(file_path)}: {str(e)}")
+        return None
+
+    predicted_values = np.array(predicted_values, dtype=np.float64)
+    real_values = np.array(real_values, dtype=np.float64)
+    prediction_days = np.array(prediction_days, dtype=np.int64)
+    prediction_sources = np.array(prediction_sources, dtype=np.int64)
+
+    mask = (prediction_days >= 1) & (real_values != 0)
+    real_values = real_values[mask]
+    errors = np.abs(predicted_values[mask] - real_values) / np.abs(real_values)
+    interaction_values = np.array(
+        [(prediction, real) for _, prediction, real in interactions], dtype=np.float64
+    ).reshape(-1, 2)
+    interaction_errors = np.abs(
+        interaction_values[:, 0] - interaction_values[:, 1]
+    ) / np.abs(interaction_values[:, 1])
+
+    records = pd.DataFrame(
+        {
+            "model": model,
+            "source": np.array(list(source_ids), dtype=object)[
+                prediction_sources[mask]
+            ],
+            "ticker": ticker,
+            "day": prediction_days[mask],
+            "error": errors.astype(ERROR_DTYPE),
+        },
+        columns=RECORD_COLUMNS,
+    )
+
+    interaction_records = pd.DataFrame(
+        {
+            "model": model,
+            "source": [source for source, _, _ in interactions],
+            "ticker": ticker,
+            "error": interaction_errors.astype(ERROR_DTYPE),
+        },
+        columns=INTERACTION_COLUMNS,
+    )
+
+    return {
+        "records": records,
+        "interaction_records": interaction_records,
+        "valid_articles": dict(valid_articles),
+    }
+
+
+def load_cache(data_dir):
+    """
+    @brief Load cached records and manifest of previously processed files
+    @param data_dir Directory containing JSON prediction files
+    @return Tuple of DataFrames of cached records and interaction records (with "file"
+            column) and manifest dictionary mapping file names to their modification
+            time and valid articles, all empty if there is no usable cache
+    """
+    empty = (
+        pd.DataFrame(columns=RECORD_COLUMNS + ["file"]).astype(
+            {"day": np.int64, "error": ERROR_DTYPE}
+        ),
+        pd.DataFrame(columns=INTERACTION_COLUMNS + ["file"]).astype(
+            {"error": ERROR_DTYPE}
+        ),
+        {},
+    )
+    try:
+        with open(os.path.join(data_dir, MANIFEST_FILE), "rb") as f:
+            manifest = orjson.loads(f.read())
+        if manifest.get("version") != CACHE_VERSION:
+            return empty
+        records = pd.read_parquet(os.path.join(data_dir, CACHE_FILE), memory_map=True)
+        interaction_records = pd.read_parquet(
+            os.path.join(data_dir, INTERACTION_CACHE_FILE), memory_map=True
+        )
+    except (orjson.JSONDecodeError, OSError, ValueError):
+        return empty
+
+    return records, interaction_records, manifest["files"]
+
+
+def save_cache(data_dir, records, interaction_records, manifest):
+    """
+    @brief Store records and manifest of processed files for next runs
+    @param data_dir Directory containing JSON prediction files
+    @param records DataFrame of records of all processed files (with "file" column)
+    @param interaction_records DataFrame of interaction records of all processed files
+           (with "file" column)
+    @param manifest Dictionary mapping file names to modification time and valid articles
+    """
+    try:
+        records.to_parquet(
+            os.path.join(data_dir, CACHE_FILE), compression="zstd", index=False
+        )
+        interaction_records.to_parquet(
+            os.path.join(data_dir, INTERACTION_CACHE_FILE),
+            compression="zstd",
+            index=False,
+        )
+        with open(os.path.join(data_dir, MANIFEST_FILE), "wb") as f:
+            f.write(orjson.dumps({"version": CACHE_VERSION, "files": manifest}))
+    except OSError as e:
+        print(f"Warning: Failed to save cache: {str(e)}")
 
+
+def scan_data_dir(data_dir):
+    """
+    @brief Find JSON prediction files and their modification times
+    @details Single directory scan, hidden files (cache manifest) are skipped
+    @param data_dir Directory containing JSON prediction files
+    @return Dictionary mapping file names to modification times, empty if directory
+            does not exist
+    """
+    mtimes = {}
+    try:
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
                 if (
-                    day is None
-                    or day < 1
-                    or day > max_day
-                    or real is None
-                    or prediction is None
-                    or real == 0
+                    entry.name.endswith(".json")
+                    and not entry.name.startswith(".")
+                    and entry.is_file()
                 ):
-                    continue
+                    mtimes[entry.name] = entry.stat().st_mtime
+    except FileNotFoundError:
+        pass
+
+    return mtimes
+
+
+@functools.lru_cache(maxsize=1)
+def load_records(data_dir, file_mtimes):
+    """
+    @brief Load records of all prediction files of all prediction days
+    @details Only files changed since the last run are parsed (in parallel worker
+             processes), records of other files are read from cache. Result is kept
+             for the last directory state, so further load_data calls of the same run
+             (with other maximum day) do not read anything again
+    @param data_dir Directory containing JSON prediction files
+    @param file_mtimes Tuple of (file name, modification time) pairs of JSON files, None
+           to use cached files without checking them for changes
+    @return Tuple of DataFrames of prediction error records and interaction records,
+            dictionary of article counts per source and dictionary of model display names
+    """
+    cached_records, cached_interactions, cached_manifest = load_cache(data_dir)
+
+    if file_mtimes is None:
+        # Cached files are trusted to be unchanged
+        mtimes = {name: entry["mtime"] for name, entry in cached_manifest.items()}
+    else:
+        mtimes = dict(file_mtimes)
+
+    file_paths = [os.path.join(data_dir, name) for name in mtimes]
+    print(f"Found {len(file_paths)} JSON files")
+
+    # Drop cached files which were changed or deleted since they were processed
+    manifest = {
+        name: entry
+        for name, entry in cached_manifest.items()
+        if mtimes.get(name) == entry["mtime"]
+    }
+    file_records = [cached_records[cached_records["file"].isin(list(manifest))]]
+    file_interactions = [
+        cached_interactions[cached_interactions["file"].isin(list(manifest))]
+    ]
+
+    changed_paths = [
+        path for path in file_paths if os.path.basename(path) not in manifest
+    ]
+    print(f"Using cached data for {len(manifest)} files")
 
-                percentage_error = abs(prediction - real) / abs(real)
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(process_file, changed_paths, chunksize=4)
 
-                # Track metrics by day (all models/sources)
-                day_metrics[day]["errors"].append(percentage_error)
-                day_metrics[day]["count"] += 1
+        for path, result in zip(changed_paths, results):
+            name = os.path.basename(path)
 
-                # Track metrics by model and day
-                model_day_metrics[model][day].append(percentage_error)
-                model_counts[model][day] += 1
-                model_overall[model].append(percentage_error)
+            # Invalid files are cached too, so they are not parsed again until changed
+            manifest[name] = {"mtime": mtimes[name], "valid_articles": {}}
+            if result is None:
+                continue
 
-                # Track metrics by source and day
-                source_day_metrics[source][day].append(percentage_error)
-                source_counts[source][day] += 1
-                source_overall[source].append(percentage_error)
+            manifest[name]["valid_articles"] = {
+                source: list(articles)
+                for source, articles in result["valid_articles"].items()
+            }
+            if not result["records"].empty:
+                file_records.append(result["records"].assign(file=name))
+            if not result["interaction_records"].empty:
+                file_interactions.append(
+                    result["interaction_records"].assign(file=name)
+                )
 
-                # Track metrics by ticker
-                ticker_metrics[ticker][day].append(percentage_error)
+    records = pd.concat(file_records, ignore_index=True)
+    interaction_records = pd.concat(file_interactions, ignore_index=True)
+    if changed_paths or len(manifest) != len(cached_manifest):
+        save_cache(data_dir, records, interaction_records, manifest)
 
     # Count valid articles per source
-    for source, articles in source_valid_articles.items():
-        source_article_counts[source] = len(articles)
+    source_valid_articles = defaultdict(set)
+    for entry in manifest.values():
+        for source, articles in entry["valid_articles"].items():
+            source_valid_articles[source].update(articles)
+
+    source_article_counts = {
+        source: len(articles) for source, articles in source_valid_articles.items()
+    }
+
+    records = records.drop(columns="file").astype(KEY_DTYPES)
+    interaction_records = interaction_records.drop(columns="file").astype(KEY_DTYPES)
+
+    # Model names without provider prefix for tables and graphs
+    models = records["model"].cat.categories.union(
+        interaction_records["model"].cat.categories
+    )
+    display_names = {model: model.replace("meta-llama/", "") for model in models}
+
+    return records, interaction_records, source_article_counts, display_names
+
+
+def load_data(data_dir, max_day=12, min_articles_per_source=1, rescan=True):
+    """
+    @brief Load and process prediction data from JSON files
+    @details Files are read only by the first call, further calls with the same data
+             directory only select prediction days
+    @param data_dir Directory containing JSON prediction files
+    @param max_day Maximum prediction day to include in analysis
+    @param min_articles_per_source Minimum articles required per source
+    @param rescan Whether to check data directory for new and changed files, otherwise
+           only cached records are used
+    @return Dictionary containing DataFrame of prediction error records (one row per
+            prediction with model, source, ticker, day and error), DataFrame of
+            interaction records (predictions of all days), article counts per source and
+            display names of models
+    """
+    print(f"Processing JSON files in {data_dir}...")
+
+    file_mtimes = tuple(scan_data_dir(data_dir).items()) if rescan else None
+    records, interaction_records, source_article_counts, display_names = load_records(
+        data_dir, file_mtimes
+    )
 
     return {
-        "day_metrics": day_metrics,
-        "model_day_metrics": model_day_metrics,
-        "source_day_metrics": source_day_metrics,
-        "model_counts": model_counts,
-        "source_counts": source_counts,
-        "model_overall": model_overall,
-        "source_overall": source_overall,
-        "ticker_metrics": ticker_metrics,
-        "source_article_counts": source_article_counts,
+        "records": records[records["day"] <= max_day].reset_index(drop=True),
+        "interaction_records": interaction_records,
+        "source_article_counts": dict(source_article_counts),
+        "display_names": display_names,
     }
 
 
-def plot_accuracy_over_time(data, max_day, min_datapoints=10, output_dir="graphs"):
+def error_stats(records, keys):
+    """
+    @brief Compute MAPE and number of samples of prediction error records in groups
+    @param records DataFrame of prediction error records
+    @param keys Column name (or list of column names) to group records by
+    @return DataFrame indexed by the group keys with "mape" (in %) and "count" columns
+    """
+    stats = records.groupby(keys, observed=True)["error"].agg(["mean", "size"])
+    return pd.DataFrame({"mape": stats["mean"] * 100, "count": stats["size"]})
+
+
+def day_error_stats(data, key, max_day=None):
+    """
+    @brief Get MAPE and number of samples of records grouped by key and prediction day
+    @details Statistics are computed once per data dictionary and key, all plots and
+             tables by day reuse them
+    @param data Processed metrics dictionary
+    @param key Record column to group by (None to group by prediction day only)
+    @param max_day Maximum prediction day to include, None for all days of records
+    @return DataFrame indexed by the key and day with "mape" (in %) and "count" columns
+    """
+    cached_stats = data.setdefault("day_stats", {})
+    if key not in cached_stats:
+        keys = "day" if key is None else [key, "day"]
+        cached_stats[key] = error_stats(data["records"], keys)
+
+    stats = cached_stats[key]
+    if max_day is None:
+        return stats
+    return stats[stats.index.get_level_values("day") <= max_day]
+
+
+def render_graph(figure_data, path):
+    """
+    @brief Save pickled figure to file, runs in graph worker process
+    @param figure_data Pickled matplotlib figure
+    @param path Path of output graph file, its extension selects format
+    """
+    figure = pickle.loads(figure_data)
+    figure.savefig(path)
+    plt.close(figure)
+
+
+def save_graph(name, output_dir, formats):
+    """
+    @brief Save current figure in all requested formats and close it
+    @details Figure is rendered to files by worker processes, one per format, so the
+             next graph can be built meanwhile; wait_for_graphs() waits for all saves
+    @param name File name of the graph without extension
+    @param output_dir Existing directory to save output graphs
+    @param formats File formats (extensions) to save the graph in
+    """
+    global graph_executor
+
+    if graph_executor is None:
+        graph_executor = ProcessPoolExecutor()
+
+    plt.tight_layout()
+    figure = plt.gcf()
+    figure_data = pickle.dumps(figure)
+    for extension in formats:
+        path = os.path.join(output_dir, f"{name}.{extension}")
+        pending_graphs.append(graph_executor.submit(render_graph, figure_data, path))
+    plt.close(figure)
+
+
+def wait_for_graphs():
+    """
+    @brief Wait until all graphs are saved and stop graph worker processes
+    @details Errors raised while saving any graph are re-raised here
+    """
+    global graph_executor
+
+    for future in pending_graphs:
+        future.result()
+    pending_graphs.clear()
+
+    if graph_executor is not None:
+        graph_executor.shutdown()
+        graph_executor = None
+
+
+def plot_accuracy_over_time(
+    data, max_day, min_datapoints=10, output_dir="graphs", formats=GRAPH_FORMATS
+):
     """
     @brief Plot overall prediction MAPE degradation over time
     @param data Processed metrics dictionary
     @param max_day Maximum prediction day to plot
     @param min_datapoints Minimum samples required per day
-    @param output_dir Directory to save output graphs
+    @param output_dir Existing directory to save output graphs
+    @param formats File formats to save graphs in
     """
-    os.makedirs(output_dir, exist_ok=True)
-    day_metrics = data["day_metrics"]
-
-    days = sorted(day for day in day_metrics.keys() if day <= max_day)
-    if not days:
+    day_stats = day_error_stats(data, None, max_day)
+    if day_stats.empty:
         print("No day data to plot.")
         return
 
     # Calculate overall MAPE by day
-    day_mape = []
-    day_counts = []
-    for day in days:
-        if day_metrics[day]["count"] >= min_datapoints:
-            day_mape.append(np.mean(day_metrics[day]["errors"]) * 100)
-            day_counts.append(day_metrics[day]["count"])
-        else:
-            day_mape.append(np.nan)
-            day_counts.append(0)
+    days = day_stats.index.tolist()
+    day_mape = day_stats["mape"].where(day_stats["count"] >= min_datapoints).tolist()
 
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.plot(days, day_mape, marker="o", linestyle="-", color="b", label="All Models")
@@ -172,59 +542,55 @@ def plot_accuracy_over_time(data, max_day, min_datapoints=10, output_dir="graphs
     ax.set_xlim(left=0)
     ax.set_ylim(bottom=0)
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "accuracy_over_time.png"))
-    plt.savefig(os.path.join(output_dir, "accuracy_over_time.pdf"))
-    plt.close()
+    save_graph("accuracy_over_time", output_dir, formats)
 
 
 def plot_model_accuracy_over_time(
-    data, max_day, min_datapoints=10, output_dir="graphs"
+    data, max_day, min_datapoints=10, output_dir="graphs", formats=GRAPH_FORMATS
 ):
     """
     @brief Plot MAPE trends for individual models over time
     @param data Processed metrics dictionary
     @param max_day Maximum prediction day to plot
     @param min_datapoints Minimum samples required per day
-    @param output_dir Directory to save output graphs
+    @param output_dir Existing directory to save output graphs
+    @param formats File formats to save graphs in
     """
-    os.makedirs(output_dir, exist_ok=True)
-    model_day_metrics = data["model_day_metrics"]
-    model_counts = data["model_counts"]
-    day_metrics = data["day_metrics"]
-
-    days = sorted(day for day in day_metrics.keys() if day <= max_day)
-    if not days:
+    model_day_stats = day_error_stats(data, "model", max_day)
+    if model_day_stats.empty:
         print("No model-day data to plot.")
         return
 
     # Filter models with sufficient data
-    valid_models = [
-        model
-        for model in model_day_metrics
-        if sum(model_counts[model].values()) >= min_datapoints
-    ]
+    model_totals = (
+        day_error_stats(data, "model")["count"].groupby("model", observed=True).sum()
+    )
+    valid_models = model_totals.index[model_totals >= min_datapoints]
 
-    if not valid_models:
+    if valid_models.empty:
         print("No models meet the minimum datapoint requirement.")
         return
 
+    model_day_stats = model_day_stats[model_day_stats["count"] >= min_datapoints]
+    model_day_mape = model_day_stats["mape"].unstack("day")
+
     fig, ax = plt.subplots(figsize=(12, 6))
 
     for model in sorted(valid_models):
 
-        model_mape = []
-        valid_days = []
-        for day in days:
-            if (
-                day in model_day_metrics[model]
-                and len(model_day_metrics[model][day]) >= min_datapoints
-            ):
-                model_mape.append(np.mean(model_day_metrics[model][day]) * 100)
-                valid_days.append(day)
+        if model in model_day_mape.index:
+            model_mape = model_day_mape.loc[model].dropna()
+        else:
+            model_mape = pd.Series(dtype=np.float64)
 
-        display_name = model.replace("meta-llama/", "")
-        ax.plot(valid_days, model_mape, marker="2", linestyle="-", label=display_name)
+        display_name = data["display_names"][model]
+        ax.plot(
+            model_mape.index.tolist(),
+            model_mape.tolist(),
+            marker="2",
+            linestyle="-",
+            label=display_name,
+        )
 
     ax.set_xlabel("Prediction Day")
     ax.set_ylabel("Mean Absolute Percentage Error (MAPE) %")
@@ -241,63 +607,45 @@ def plot_model_accuracy_over_time(
     # Move legend inside plot at bottom right
     ax.legend(loc="lower right")
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "model_accuracy_over_time.png"))
-    plt.savefig(os.path.join(output_dir, "model_accuracy_over_time.pdf"))
-    plt.close()
+    save_graph("model_accuracy_over_time", output_dir, formats)
 
 
 def plot_source_accuracy_over_time(
-    data, max_day, min_datapoints=10, output_dir="graphs"
+    data, max_day, min_datapoints=10, output_dir="graphs", formats=GRAPH_FORMATS
 ):
     """
     @brief Plot MAPE trends for individual sources over time
     @param data Processed metrics dictionary
     @param max_day Maximum prediction day to plot
     @param min_datapoints Minimum samples required per day
-    @param output_dir Directory to save output graphs
+    @param output_dir Existing directory to save output graphs
+    @param formats File formats to save graphs in
     """
-    os.makedirs(output_dir, exist_ok=True)
-    source_day_metrics = data["source_day_metrics"]
-    source_counts = data["source_counts"]
     source_article_counts = data["source_article_counts"]
-    day_metrics = data["day_metrics"]
 
-    days = sorted(day for day in day_metrics.keys() if day <= max_day)
-    if not days:
+    source_day_stats = day_error_stats(data, "source", max_day)
+    if source_day_stats.empty:
         print("No source-day data to plot.")
         return
 
     # Filter sources with sufficient data and at least one valid day
-    valid_sources = []
-    for source in source_day_metrics:
-        valid_days = [
-            day
-            for day in days
-            if (
-                day in source_day_metrics[source]
-                and len(source_day_metrics[source][day]) >= min_datapoints
-            )
-        ]
-        if valid_days:
-            article_count = source_article_counts.get(source, 0)
-            valid_sources.append((source, valid_days, article_count))
-
-    if not valid_sources:
+    source_day_stats = source_day_stats[source_day_stats["count"] >= min_datapoints]
+    source_day_mape = source_day_stats["mape"].unstack("day")
+
+    if source_day_mape.empty:
         print("No sources meet the minimum datapoint requirement.")
         return
 
     fig, ax = plt.subplots(figsize=(12, 6))
 
-    for source, valid_days, article_count in sorted(valid_sources, key=lambda x: x[0]):
-        source_mape = []
-        for day in valid_days:
-            source_mape.append(np.mean(source_day_metrics[source][day]) * 100)
+    for source in sorted(source_day_mape.index):
+        source_mape = source_day_mape.loc[source].dropna()
+        article_count = source_article_counts.get(source, 0)
 
         # Add article count to label
         ax.plot(
-            valid_days,
-            source_mape,
+            source_mape.index.tolist(),
+            source_mape.tolist(),
             marker=".",
             linestyle="-",
             label=f"{source} (articles={article_count})",
@@ -318,143 +666,132 @@ def plot_source_accuracy_over_time(
     # Move legend inside plot at bottom right
     ax.legend(loc="lower right")
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "source_accuracy_over_time.png"))
-    plt.savefig(os.path.join(output_dir, "source_accuracy_over_time.pdf"))
-    plt.close()
+    save_graph("source_accuracy_over_time", output_dir, formats)
 
 
-def plot_model_comparison(data, max_day, min_datapoints=10, output_dir="graphs"):
+def plot_bar_comparison(
+    names, mapes, counts, color, title, rotation, ha, name, output_dir, formats
+):
     """
-    @brief Generate bar chart comparing overall model MAPE
-    @param data Processed metrics dictionary
-    @param max_day Maximum prediction day included
-    @param min_datapoints Minimum samples required per model
-    @param output_dir Directory to save output graphs
+    @brief Generate bar chart of MAPE values with counts at the bottom of the bars
+    @param names Labels of the bars
+    @param mapes MAPE values (in %) of the bars
+    @param counts Numbers of samples (or articles) shown under the bars
+    @param color Color of the bars
+    @param title Title of the graph
+    @param rotation Rotation of the bar labels
+    @param ha Horizontal alignment of the bar labels
+    @param name Graph file name without extension
+    @param output_dir Existing directory to save output graphs
+    @param formats File formats to save graphs in
     """
-    os.makedirs(output_dir, exist_ok=True)
-    model_overall = data["model_overall"]
-
-    # Calculate overall MAPE for each model
-    model_stats = []
-    for model, errors in model_overall.items():
-        if len(errors) >= min_datapoints:
-            mape = np.mean(errors) * 100
-            display_name = model.replace("meta-llama/", "")
-            model_stats.append((display_name, mape, len(errors)))
-
-    if not model_stats:
-        print("No models meet the minimum datapoint requirement.")
-        return
-
-    # Sort by MAPE
-    model_stats.sort(key=lambda x: x[1])
-    model_names = [m[0] for m in model_stats]
-    model_mapes = [m[1] for m in model_stats]
-    model_counts = [m[2] for m in model_stats]
+    fig, ax = plt.subplots(figsize=(max(10, len(names) * 0.7), 6))
+    bars = ax.bar(names, mapes, color=color)
 
-    fig, ax = plt.subplots(figsize=(max(10, len(model_names) * 0.7), 6))
-    bars = ax.bar(model_names, model_mapes, color="skyblue")
-
-    for i, bar in enumerate(bars):
-        height = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width() / 2.0,
-            height,
-            f"{height:.2f}%",
-            ha="center",
-            va="bottom",
-        )
+    # Add value labels
+    ax.bar_label(bars, fmt="{:.2f}%")
+    count_y = ax.get_ylim()[0] * 0.95
+    for bar, count in zip(bars, counts):
         ax.text(
             bar.get_x() + bar.get_width() / 2.0,
-            ax.get_ylim()[0] * 0.95,
-            f"n={model_counts[i]}",
+            count_y,
+            f"n={count}",
             ha="center",
             va="bottom",
         )
 
     ax.set_ylabel("Mean Absolute Percentage Error (MAPE) %")
-    ax.set_title(
-        f"Model MAPE Comparison (Days 1-{max_day}, Min {min_datapoints} samples)"
-    )
-    plt.xticks(rotation=45, ha="right")
+    ax.set_title(title)
+    plt.xticks(rotation=rotation, ha=ha)
     ax.grid(axis="y", linestyle="--", alpha=0.7)
 
     # Set y-axis to start at 0
     ax.set_ylim(bottom=0)
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "model_comparison.png"))
-    plt.savefig(os.path.join(output_dir, "model_comparison.pdf"))
-    plt.close()
+    save_graph(name, output_dir, formats)
 
 
-def plot_source_comparison(data, max_day, min_articles=10, output_dir="graphs"):
+def plot_model_comparison(
+    data, max_day, min_datapoints=10, output_dir="graphs", formats=GRAPH_FORMATS
+):
+    """
+    @brief Generate bar chart comparing overall model MAPE
+    @param data Processed metrics dictionary
+    @param max_day Maximum prediction day included
+    @param min_datapoints Minimum samples required per model
+    @param output_dir Existing directory to save output graphs
+    @param formats File formats to save graphs in
+    """
+    # Calculate overall MAPE for each model
+    model_stats = error_stats(data["records"], "model")
+    model_stats = model_stats[model_stats["count"] >= min_datapoints]
+
+    if model_stats.empty:
+        print("No models meet the minimum datapoint requirement.")
+        return
+
+    # Sort by MAPE
+    model_stats = model_stats.sort_values("mape", kind="stable")
+    model_names = [data["display_names"][model] for model in model_stats.index]
+    model_mapes = model_stats["mape"].tolist()
+    model_counts = model_stats["count"].tolist()
+
+    plot_bar_comparison(
+        model_names,
+        model_mapes,
+        model_counts,
+        "skyblue",
+        f"Model MAPE Comparison (Days 1-{max_day}, Min {min_datapoints} samples)",
+        45,
+        "right",
+        "model_comparison",
+        output_dir,
+        formats,
+    )
+
+
+def plot_source_comparison(
+    data, max_day, min_articles=10, output_dir="graphs", formats=GRAPH_FORMATS
+):
     """
     @brief Generate bar chart comparing overall source MAPE
     @param data Processed metrics dictionary
     @param max_day Maximum prediction day included
     @param min_articles Minimum articles required per source
-    @param output_dir Directory to save output graphs
+    @param output_dir Existing directory to save output graphs
+    @param formats File formats to save graphs in
     """
-    os.makedirs(output_dir, exist_ok=True)
-    source_overall = data["source_overall"]
     source_article_counts = data["source_article_counts"]
 
     # Calculate overall MAPE for each source
-    source_stats = []
-    for source, errors in source_overall.items():
-        article_count = source_article_counts.get(source, 0)
-        if article_count >= min_articles:
-            mape = np.mean(errors) * 100
-            source_stats.append((source, mape, article_count))
+    source_stats = error_stats(data["records"], "source")
+    source_stats["articles"] = [
+        source_article_counts.get(source, 0) for source in source_stats.index
+    ]
+    source_stats = source_stats[source_stats["articles"] >= min_articles]
 
-    if not source_stats:
+    if source_stats.empty:
         print(f"No sources meet the minimum article requirement ({min_articles}).")
         return
 
     # Sort by MAPE
-    source_stats.sort(key=lambda x: x[1])
-    source_names = [s[0] for s in source_stats]
-    source_mapes = [s[1] for s in source_stats]
-    source_articles = [s[2] for s in source_stats]
-
-    fig, ax = plt.subplots(figsize=(max(10, len(source_names) * 0.7), 6))
-    bars = ax.bar(source_names, source_mapes, color="lightgreen")
-
-    # Add value labels
-    for i, bar in enumerate(bars):
-        height = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width() / 2.0,
-            height,
-            f"{height:.2f}%",
-            ha="center",
-            va="bottom",
-        )
-        ax.text(
-            bar.get_x() + bar.get_width() / 2.0,
-            ax.get_ylim()[0] * 0.95,
-            f"n={source_articles[i]}",
-            ha="center",
-            va="bottom",
-        )
-
-    ax.set_ylabel("Mean Absolute Percentage Error (MAPE) %")
-    ax.set_title(
-        f"Source MAPE Comparison (Days 1-{max_day}, Min {min_articles} articles)"
+    source_stats = source_stats.sort_values("mape", kind="stable")
+    source_names = source_stats.index.tolist()
+    source_mapes = source_stats["mape"].tolist()
+    source_articles = source_stats["articles"].tolist()
+
+    plot_bar_comparison(
+        source_names,
+        source_mapes,
+        source_articles,
+        "lightgreen",
+        f"Source MAPE Comparison (Days 1-{max_day}, Min {min_articles} articles)",
+        90,
+        "center",
+        "source_comparison",
+        output_dir,
+        formats,
     )
-    plt.xticks(rotation=90, ha="center")
-    ax.grid(axis="y", linestyle="--", alpha=0.7)
-
-    # Set y-axis to start at 0
-    ax.set_ylim(bottom=0)
-
-    plt.subplots_adjust(bottom=0.4)
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "source_comparison.png"))
-    plt.savefig(os.path.join(output_dir, "source_comparison.pdf"))
-    plt.close()
 
 
 def print_summary_stats(data, max_day, min_datapoints=10):
@@ -470,120 +807,94 @@ def print_summary_stats(data, max_day, min_datapoints=10):
 
     print("\nModel Performance:")
     print("-" * 70)
-    model_stats = []
-    for model, errors in data["model_overall"].items():
-        if len(errors) >= min_datapoints:
-            mape = np.mean(errors) * 100
-            display_name = model.replace("meta-llama/", "")
-            model_stats.append((display_name, mape, len(errors)))
+    model_stats = error_stats(data["records"], "model")
+    model_stats = model_stats[model_stats["count"] >= min_datapoints]
 
-    for name, mape, count in sorted(model_stats, key=lambda x: x[1]):
-        print(f"  {name:<25} | MAPE: {mape:>6.2f}% | n: {count:<5}")
+    for model, row in model_stats.sort_values("mape", kind="stable").iterrows():
+        name = data["display_names"][model]
+        print(f"  {name:<25} | MAPE: {row['mape']:>6.2f}% | n: {int(row['count']):<5}")
 
     print("\nSource Performance:")
     print("-" * 70)
-    source_stats = []
-    for source, errors in data["source_overall"].items():
-        if len(errors) >= min_datapoints:
-            mape = np.mean(errors) * 100
-            source_stats.append((source, mape, len(errors)))
+    source_stats = error_stats(data["records"], "source")
+    source_stats = source_stats[source_stats["count"] >= min_datapoints]
 
-    for source, mape, count in sorted(source_stats, key=lambda x: x[1]):
-        print(f"  {source:<25} | MAPE: {mape:>6.2f}% | n: {count:<5}")
+    for source, row in source_stats.sort_values("mape", kind="stable").iterrows():
+        print(
+            f"  {source:<25} | MAPE: {row['mape']:>6.2f}% | n: {int(row['count']):<5}"
+        )
 
 
-def save_model_performance_by_day(data, max_day, output_dir="tables"):
+def write_table(table, file_name, output_dir):
     """
-    @brief Save model performance by day to CSV
+    @brief Write table to CSV, floats are written as percentages with two decimals
+    @details Rows end with CRLF like rows written by csv.writer
+    @param table DataFrame to write, its index is not written
+    @param file_name Name of output CSV file
+    @param output_dir Directory to save output CSV
+    """
+    table.to_csv(
+        os.path.join(output_dir, file_name),
+        index=False,
+        float_format="%.2f%%",
+        na_rep="N/A",
+        lineterminator="\r\n",
+    )
+
+
+def save_performance_by_day(data, key, label, max_day, file_name, output_dir):
+    """
+    @brief Save performance of groups of records by day to CSV
     @param data Processed metrics dictionary
+    @param key Record column to group by
+    @param label Header of the group column
     @param max_day Maximum prediction day to include
+    @param file_name Name of output CSV file
     @param output_dir Directory to save output CSV
     """
     os.makedirs(output_dir, exist_ok=True)
-    model_day_metrics = data["model_day_metrics"]
-    model_counts = data["model_counts"]
+    all_records = data["records"]
+    records = all_records[all_records["day"] <= max_day]
 
-    header = (
-        ["Model"]
-        + [f"Day {day} MAPE" for day in range(1, max_day + 1)]
-        + ["Overall MAPE", "Total Samples"]
-    )
+    names = all_records[key].unique().tolist()
+    days = list(range(1, max_day + 1))
 
-    rows = []
-    for model in model_day_metrics:
-        row = [model.replace("meta-llama/", "")]
-        total_errors = []
-
-        for day in range(1, max_day + 1):
-            if day in model_day_metrics[model]:
-                mape = np.mean(model_day_metrics[model][day]) * 100
-                row.append(f"{mape:.2f}%")
-                total_errors.extend(model_day_metrics[model][day])
-            else:
-                row.append("N/A")
-
-        if total_errors:
-            overall_mape = np.mean(total_errors) * 100
-            row.append(f"{overall_mape:.2f}%")
-            row.append(str(len(total_errors)))
-        else:
-            row.extend(["N/A", "0"])
+    day_mape = day_error_stats(data, key, max_day)["mape"].unstack("day")
+    overall = error_stats(records, key).reindex(names)
 
-        rows.append(row)
+    table = day_mape.reindex(index=names, columns=days)
+    table.columns = [f"Day {day} MAPE" for day in days]
+    if key == "model":
+        names = [data["display_names"][name] for name in names]
+    table.insert(0, label, names)
+    table["Overall MAPE"] = overall["mape"].to_numpy()
+    table["Total Samples"] = overall["count"].fillna(0).astype(int).to_numpy()
 
-    with open(
-        os.path.join(output_dir, "model_performance_by_day.csv"), "w", newline=""
-    ) as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(sorted(rows, key=lambda x: x[0]))  # Sort by model name
+    write_table(table.sort_values(label, kind="stable"), file_name, output_dir)
 
 
-def save_source_performance_by_day(data, max_day, output_dir="tables"):
+def save_model_performance_by_day(data, max_day, output_dir="tables"):
     """
-    @brief Save source performance by day to CSV
+    @brief Save model performance by day to CSV
     @param data Processed metrics dictionary
     @param max_day Maximum prediction day to include
     @param output_dir Directory to save output CSV
     """
-    os.makedirs(output_dir, exist_ok=True)
-    source_day_metrics = data["source_day_metrics"]
-    source_counts = data["source_counts"]
-
-    header = (
-        ["Source"]
-        + [f"Day {day} MAPE" for day in range(1, max_day + 1)]
-        + ["Overall MAPE", "Total Samples"]
+    save_performance_by_day(
+        data, "model", "Model", max_day, "model_performance_by_day.csv", output_dir
     )
 
-    rows = []
-    for source in source_day_metrics:
-        row = [source]
-        total_errors = []
-
-        for day in range(1, max_day + 1):
-            if day in source_day_metrics[source]:
-                mape = np.mean(source_day_metrics[source][day]) * 100
-                row.append(f"{mape:.2f}%")
-                total_errors.extend(source_day_metrics[source][day])
-            else:
-                row.append("N/A")
-
-        if total_errors:
-            overall_mape = np.mean(total_errors) * 100
-            row.append(f"{overall_mape:.2f}%")
-            row.append(str(len(total_errors)))
-        else:
-            row.extend(["N/A", "0"])
-
-        rows.append(row)
 
-    with open(
-        os.path.join(output_dir, "source_performance_by_day.csv"), "w", newline=""
-    ) as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(sorted(rows, key=lambda x: x[0]))  # Sort by source name
+def save_source_performance_by_day(data, max_day, output_dir="tables"):
+    """
+    @brief Save source performance by day to CSV
+    @param data Processed metrics dictionary
+    @param max_day Maximum prediction day to include
+    @param output_dir Directory to save output CSV
+    """
+    save_performance_by_day(
+        data, "source", "Source", max_day, "source_performance_by_day.csv", output_dir
+    )
 
 
 def save_ticker_performance_by_day(data, max_day, output_dir="tables"):
@@ -593,44 +904,10 @@ def save_ticker_performance_by_day(data, max_day, output_dir="tables"):
     @param max_day Maximum prediction day to include
     @param output_dir Directory to save output CSV
     """
-    os.makedirs(output_dir, exist_ok=True)
-    ticker_metrics = data["ticker_metrics"]
-
-    header = (
-        ["Ticker"]
-        + [f"Day {day} MAPE" for day in range(1, max_day + 1)]
-        + ["Overall MAPE", "Total Samples"]
+    save_performance_by_day(
+        data, "ticker", "Ticker", max_day, "ticker_performance_by_day.csv", output_dir
     )
 
-    rows = []
-    for ticker in ticker_metrics:
-        row = [ticker]
-        total_errors = []
-
-        for day in range(1, max_day + 1):
-            if day in ticker_metrics[ticker]:
-                mape = np.mean(ticker_metrics[ticker][day]) * 100
-                row.append(f"{mape:.2f}%")
-                total_errors.extend(ticker_metrics[ticker][day])
-            else:
-                row.append("N/A")
-
-        if total_errors:
-            overall_mape = np.mean(total_errors) * 100
-            row.append(f"{overall_mape:.2f}%")
-            row.append(str(len(total_errors)))
-        else:
-            row.extend(["N/A", "0"])
-
-        rows.append(row)
-
-    with open(
-        os.path.join(output_dir, "ticker_performance_by_day.csv"), "w", newline=""
-    ) as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(sorted(rows, key=lambda x: x[0]))  # Sort by ticker
-
 
 def save_model_source_interaction(data, output_dir="tables"):
     """
@@ -639,51 +916,24 @@ def save_model_source_interaction(data, output_dir="tables"):
     @param output_dir Directory to save output CSV
     """
     os.makedirs(output_dir, exist_ok=True)
-    model_source_metrics = defaultdict(lambda: defaultdict(list))
-
-    for file_path in glob.glob(os.path.join(data["data_dir"], "*.json")):
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                file_data = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            continue
-
-        model = file_data.get("model")
-        predictions_by_article = file_data.get("predictionsByArticle", [])
-
-        for article in predictions_by_article:
-            source = article.get("source")
-            predictions = article.get("predictions", {})
 
-            if not model or not source or not predictions:
-                continue
+    # Interactions of articles without source (missing or empty) are left out
+    records = data["interaction_records"]
+    records = records[records["source"].notna() & (records["source"] != "")]
+    stats = error_stats(records, ["model", "source"]).reset_index()
+
+    table = pd.DataFrame(
+        {
+            "Model": [data["display_names"][model] for model in stats["model"]],
+            "Source": stats["source"].astype(str),
+            "MAPE": stats["mape"],
+            "Samples": stats["count"],
+        }
+    )
 
-            for day_pred in predictions.values():
-                if day_pred.get("real") and day_pred.get("prediction"):
-                    error = abs(day_pred["prediction"] - day_pred["real"]) / abs(
-                        day_pred["real"]
-                    )
-                    model_source_metrics[model][source].append(error)
-
-    header = ["Model", "Source", "MAPE", "Samples"]
-    rows = []
-
-    for model in model_source_metrics:
-        clean_model = model.replace("meta-llama/", "")
-        for source in model_source_metrics[model]:
-            errors = model_source_metrics[model][source]
-            if errors:
-                mape = np.mean(errors) * 100
-                rows.append([clean_model, source, f"{mape:.2f}%", len(errors)])
-
-    with open(
-        os.path.join(output_dir, "model_source_interaction.csv"), "w", newline=""
-    ) as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(
-            sorted(rows, key=lambda x: (x[0], x[1]))
-        )  # Sort by model then source
+    # Sort by model then source
+    table = table.sort_values(["Model", "Source"], kind="stable")
+    write_table(table, "model_source_interaction.csv", output_dir)
 
 
 def save_model_ticker_interaction(data, output_dir="tables"):
@@ -693,51 +943,34 @@ def save_model_ticker_interaction(data, output_dir="tables"):
     @param output_dir Directory to save output CSV
     """
     os.makedirs(output_dir, exist_ok=True)
-    model_ticker_metrics = defaultdict(lambda: defaultdict(list))
-
-    for file_path in glob.glob(os.path.join(data["data_dir"], "*.json")):
-        ticker = os.path.basename(file_path).split("_")[0]
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                file_data = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            continue
+    stats = error_stats(data["interaction_records"], ["model", "ticker"]).reset_index()
+
+    table = pd.DataFrame(
+        {
+            "Model": [data["display_names"][model] for model in stats["model"]],
+            "Ticker": stats["ticker"].astype(str),
+            "MAPE": stats["mape"],
+            "Samples": stats["count"],
+        }
+    )
 
-        model = file_data.get("model")
-        predictions_by_article = file_data.get("predictionsByArticle", [])
+    # Sort by model then ticker
+    table = table.sort_values(["Model", "Ticker"], kind="stable")
+    write_table(table, "model_ticker_interaction.csv", output_dir)
 
-        for article in predictions_by_article:
-            predictions = article.get("predictions", {})
 
-            if not model or not predictions:
-                continue
-
-            for day_pred in predictions.values():
-                if day_pred.get("real") and day_pred.get("prediction"):
-                    error = abs(day_pred["prediction"] - day_pred["real"]) / abs(
-                        day_pred["real"]
-                    )
-                    model_ticker_metrics[model][ticker].append(error)
-
-    header = ["Model", "Ticker", "MAPE", "Samples"]
-    rows = []
-
-    for model in model_ticker_metrics:
-        clean_model = model.replace("meta-llama/", "")
-        for ticker in model_ticker_metrics[model]:
-            errors = model_ticker_metrics[model][ticker]
-            if errors:
-                mape = np.mean(errors) * 100
-                rows.append([clean_model, ticker, f"{mape:.2f}%", len(errors)])
-
-    with open(
-        os.path.join(output_dir, "model_ticker_interaction.csv"), "w", newline=""
-    ) as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(
-            sorted(rows, key=lambda x: (x[0], x[1]))
-        )  # Sort by model then ticker
+def linear_slope(x, y):
+    """
+    @brief Compute slope of least squares line fitted to points
+    @details Closed form of np.polyfit(x, y, 1)[0], without its overhead on few points
+    @param x Sequence of x coordinates (at least two distinct values)
+    @param y Sequence of y coordinates
+    @return Slope of fitted line
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_diff = x - x.mean()
+    return (x_diff * (y - y.mean())).sum() / (x_diff**2).sum()
 
 
 def save_error_trend_by_ticker(data, max_day, output_dir="tables"):
@@ -748,68 +981,54 @@ def save_error_trend_by_ticker(data, max_day, output_dir="tables"):
     @param output_dir Directory to save output CSV
     """
     os.makedirs(output_dir, exist_ok=True)
-    ticker_metrics = data["ticker_metrics"]
+    all_records = data["records"]
 
-    header = (
-        ["Ticker"]
-        + [f"Day {day} MAPE" for day in range(1, max_day + 1)]
-        + ["Slope", "Total Samples"]
-    )
+    tickers = all_records["ticker"].unique().tolist()
+    days = list(range(1, max_day + 1))
 
-    rows = []
-    for ticker in ticker_metrics:
-        row = [ticker]
-        day_values = []
-        maples = []
-
-        for day in range(1, max_day + 1):
-            if day in ticker_metrics[ticker] and ticker_metrics[ticker][day]:
-                mape = np.mean(ticker_metrics[ticker][day]) * 100
-                row.append(f"{mape:.2f}%")
-                day_values.append(day)
-                maples.append(mape)
-            else:
-                row.append("N/A")
-
-        # Calculate slope if we have at least 2 data points
-        if len(day_values) >= 2:
-            slope = np.polyfit(day_values, maples, 1)[0]
-            row.append(f"{slope:.2f}")
+    ticker_day_stats = day_error_stats(data, "ticker", max_day)
+    ticker_day_mape = (
+        ticker_day_stats["mape"].unstack("day").reindex(index=tickers, columns=days)
+    )
+    ticker_counts = ticker_day_stats["count"].groupby("ticker", observed=True).sum()
+
+    # Calculate slope if we have at least 2 data points
+    slopes = []
+    for _, mapes in ticker_day_mape.iterrows():
+        mapes = mapes.dropna()
+        if len(mapes) >= 2:
+            slopes.append(f"{linear_slope(mapes.index, mapes.to_numpy()):.2f}")
         else:
-            row.append("N/A")
-
-        row.append(
-            str(
-                sum(
-                    len(ticker_metrics[ticker][d])
-                    for d in ticker_metrics[ticker]
-                    if d <= max_day
-                )
-            )
-        )
-        rows.append(row)
+            slopes.append("N/A")
 
-    # Write to CSV
-    with open(
-        os.path.join(output_dir, "error_trend_by_ticker.csv"), "w", newline=""
-    ) as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(sorted(rows, key=lambda x: x[0]))  # Sort by ticker
+    table = ticker_day_mape.set_axis([f"Day {day} MAPE" for day in days], axis=1)
+    table.insert(0, "Ticker", tickers)
+    table["Slope"] = slopes
+    table["Total Samples"] = (
+        ticker_counts.reindex(tickers).fillna(0).astype(int).to_numpy()
+    )
 
+    write_table(
+        table.sort_values("Ticker", kind="stable"),
+        "error_trend_by_ticker.csv",
+        output_dir,
+    )
 
-def plot_source_distribution(data, output_dir="graphs", threshold_percent=1.5):
+
+def plot_source_distribution(
+    data, output_dir="graphs", threshold_percent=1.5, formats=GRAPH_FORMATS
+):
     """
     @brief Generate a horizontal bar chart showing the distribution of articles by source
     @param data Processed metrics dictionary containing source article counts
-    @param output_dir Directory to save output graphs
+    @param output_dir Existing directory to save output graphs
     @param threshold_percent Sources with percentage less than this will be grouped into "Others"
+    @param formats File formats to save graphs in
     """
     import os
     import matplotlib.pyplot as plt
     import numpy as np
 
-    os.makedirs(output_dir, exist_ok=True)
     source_article_counts = data["source_article_counts"]
 
     if not source_article_counts:
@@ -871,57 +1090,47 @@ def plot_source_distribution(data, output_dir="graphs", threshold_percent=1.5):
     ax.set_xlim(left=0)
     ax.grid(axis="x", linestyle="--", alpha=0.7)
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "source_distribution.png"))
-    plt.savefig(os.path.join(output_dir, "source_distribution.pdf"))
-    plt.close()
+    save_graph("source_distribution", output_dir, formats)
 
 
-def plot_model_comparison_combined(data_day1, data_days1to3, output_dir="graphs"):
+def plot_model_comparison_combined(
+    data_day1, data_days1to3, output_dir="graphs", formats=GRAPH_FORMATS
+):
     """
     @brief Generate combined bar chart comparing model MAPE for day1 vs days1-3
     @param data_day1 Processed metrics dictionary for day1 only
     @param data_days1to3 Processed metrics dictionary for days1-3
-    @param output_dir Directory to save output graphs
+    @param output_dir Existing directory to save output graphs
+    @param formats File formats to save graphs in
     """
-    os.makedirs(output_dir, exist_ok=True)
+    # Get model stats (MAPE and count) for day1
+    day1_stats = {
+        data_day1["display_names"][model]: (stats["mape"], int(stats["count"]))
+        for model, stats in error_stats(data_day1["records"], "model").iterrows()
+        if stats["count"] >= data_day1["min_datapoints"]
+    }
 
-    # Get model stats for day1
-    day1_stats = []
-    for model, errors in data_day1["model_overall"].items():
-        if len(errors) >= data_day1["min_datapoints"]:
-            mape = np.mean(errors) * 100
-            display_name = model.replace("meta-llama/", "")
-            day1_stats.append((display_name, mape, len(errors)))
-
-    # Get model stats for days1-3
-    days1to3_stats = []
-    for model, errors in data_days1to3["model_overall"].items():
-        if len(errors) >= data_days1to3["min_datapoints"]:
-            mape = np.mean(errors) * 100
-            display_name = model.replace("meta-llama/", "")
-            days1to3_stats.append((display_name, mape, len(errors)))
-
-    # Find models that appear in both datasets
-    common_models = set(m[0] for m in day1_stats) & set(m[0] for m in days1to3_stats)
-    if not common_models:
-        print("No common models between the two datasets")
-        return
+    # Get model stats (MAPE and count) for days1-3
+    days1to3_stats = {
+        data_days1to3["display_names"][model]: (stats["mape"], int(stats["count"]))
+        for model, stats in error_stats(data_days1to3["records"], "model").iterrows()
+        if stats["count"] >= data_days1to3["min_datapoints"]
+    }
 
-    # Create combined stats with sample counts
-    combined_stats = []
-    for model in common_models:
-        day1_entry = next(m for m in day1_stats if m[0] == model)
-        days1to3_entry = next(m for m in days1to3_stats if m[0] == model)
-        combined_stats.append(
-            (
-                model,
-                day1_entry[1],  # day1 MAPE
-                days1to3_entry[1],  # days1-3 MAPE
-                day1_entry[2],  # day1 count
-                days1to3_entry[2],  # days1-3 count
-            )
+    # Create combined stats with sample counts of models that appear in both datasets
+    combined_stats = [
+        (
+            model,
+            day1_stats[model][0],  # day1 MAPE
+            days1to3_stats[model][0],  # days1-3 MAPE
+            day1_stats[model][1],  # day1 count
+            days1to3_stats[model][1],  # days1-3 count
         )
+        for model in day1_stats.keys() & days1to3_stats.keys()
+    ]
+    if not combined_stats:
+        print("No common models between the two datasets")
+        return
 
     # Sort by day1 MAPE (ascending - from best to worst)
     combined_stats.sort(key=lambda x: x[1])
@@ -948,19 +1157,11 @@ def plot_model_comparison_combined(data_day1, data_days1to3, output_dir="graphs"
 
     # Add MAPE values on top of bars
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height,
-                f"{height:.2f}%",
-                ha="center",
-                va="bottom",
-                fontsize=9,
-            )
+        ax.bar_label(bars, fmt="{:.2f}%", fontsize=9)
 
+    ylim = ax.get_ylim()
+    y_pos = ylim[0] + (ylim[1] * 0.01)
     for i, (day1_count, days1to3_count) in enumerate(zip(day1_counts, days1to3_counts)):
-        y_pos = ax.get_ylim()[0] + (ax.get_ylim()[1] * 0.01)
 
         # Day 1 count
         ax.text(
@@ -996,55 +1197,49 @@ def plot_model_comparison_combined(data_day1, data_days1to3, output_dir="graphs"
     current_ylim = ax.get_ylim()
     ax.set_ylim(bottom=current_ylim[0], top=current_ylim[1] * 1.05)
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "model_comparison_combined.png"))
-    plt.savefig(os.path.join(output_dir, "model_comparison_combined.pdf"))
-    plt.close()
+    save_graph("model_comparison_combined", output_dir, formats)
 
 
-def plot_source_comparison_combined(data_day1, data_days1to3, output_dir="graphs"):
+def plot_source_comparison_combined(
+    data_day1, data_days1to3, output_dir="graphs", formats=GRAPH_FORMATS
+):
     """
     @brief Generate combined bar chart comparing source MAPE for day1 vs days1-3
     @param data_day1 Processed metrics dictionary for day1 only
     @param data_days1to3 Processed metrics dictionary for days1-3
-    @param output_dir Directory to save output graphs
+    @param output_dir Existing directory to save output graphs
+    @param formats File formats to save graphs in
     """
-    os.makedirs(output_dir, exist_ok=True)
+    # Get source MAPE for day1
+    day1_stats = error_stats(data_day1["records"], "source")
+    day1_mapes = day1_stats["mape"][day1_stats["count"] >= data_day1["min_datapoints"]]
+
+    # Get source MAPE for days1-3
+    days1to3_stats = error_stats(data_days1to3["records"], "source")
+    days1to3_mapes = days1to3_stats["mape"][
+        days1to3_stats["count"] >= data_days1to3["min_datapoints"]
+    ]
 
-    # Get source stats for day1
-    day1_stats = []
-    for source, errors in data_day1["source_overall"].items():
-        if len(errors) >= data_day1["min_datapoints"]:
-            mape = np.mean(errors) * 100
-            day1_stats.append((source, mape, len(errors)))
-
-    # Get source stats for days1-3
-    days1to3_stats = []
-    for source, errors in data_days1to3["source_overall"].items():
-        if len(errors) >= data_days1to3["min_datapoints"]:
-            mape = np.mean(errors) * 100
-            days1to3_stats.append((source, mape, len(errors)))
-
-    # Find sources that appear in both datasets
-    common_sources = set(s[0] for s in day1_stats) & set(s[0] for s in days1to3_stats)
-    if not common_sources:
+    # Create combined stats of sources that appear in both datasets
+    combined_stats = pd.concat(
+        {"day1": day1_mapes, "days1to3": days1to3_mapes}, axis=1, join="inner"
+    )
+    if combined_stats.empty:
         print("No common sources between the two datasets")
         return
 
-    combined_stats = []
-    for source in common_sources:
-        day1_mape = next(s[1] for s in day1_stats if s[0] == source)
-        days1to3_mape = next(s[1] for s in days1to3_stats if s[0] == source)
-        article_count = data_day1["source_article_counts"].get(source, 0)
-        combined_stats.append((source, day1_mape, days1to3_mape, article_count))
+    # Article counts of all combined sources are gathered at once
+    combined_stats["articles"] = pd.Series(
+        data_day1["source_article_counts"], dtype=np.int64
+    ).reindex(combined_stats.index, fill_value=0)
 
     # Sort by day1 MAPE (ascending - from best to worst)
-    combined_stats.sort(key=lambda x: x[1])
+    combined_stats = combined_stats.sort_values("day1", kind="stable")
 
-    source_names = [s[0] for s in combined_stats]
-    day1_mapes = [s[1] for s in combined_stats]
-    days1to3_mapes = [s[2] for s in combined_stats]
-    article_counts = [s[3] for s in combined_stats]
+    source_names = combined_stats.index.tolist()
+    day1_mapes = combined_stats["day1"].tolist()
+    days1to3_mapes = combined_stats["days1to3"].tolist()
+    article_counts = combined_stats["articles"].tolist()
 
     fig, ax = plt.subplots(figsize=(max(10, len(source_names) * 0.8), 6))
 
@@ -1059,18 +1254,11 @@ def plot_source_comparison_combined(data_day1, data_days1to3, output_dir="graphs
     )
 
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height,
-                f"{height:.2f}%",
-                ha="center",
-                va="bottom",
-            )
+        ax.bar_label(bars, fmt="{:.2f}%")
 
+    count_y = ax.get_ylim()[0]
     for i, count in enumerate(article_counts):
-        ax.text(x[i], ax.get_ylim()[0], f"articles={count}", ha="center", va="bottom")
+        ax.text(x[i], count_y, f"articles={count}", ha="center", va="bottom")
 
     ax.set_ylabel("Mean Absolute Percentage Error (MAPE) %")
     ax.set_title("Source MAPE Comparison: Day 1 vs Days 1-3")
@@ -1081,15 +1269,14 @@ def plot_source_comparison_combined(data_day1, data_days1to3, output_dir="graphs
 
     ax.set_ylim(bottom=0)
 
-    plt.subplots_adjust(bottom=0.4)
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "source_comparison_combined.png"))
-    plt.savefig(os.path.join(output_dir, "source_comparison_combined.pdf"))
-    plt.close()
+    save_graph("source_comparison_combined", output_dir, formats)
 
 
-def main():
-    """Command line interface for prediction analysis."""
+def build_parser():
+    """
+    @brief Build command line argument parser of prediction analysis
+    @return Configured ArgumentParser instance
+    """
     parser = argparse.ArgumentParser(
         description="Analyze prediction MAPE across models and sources"
     )
@@ -1108,16 +1295,43 @@ def main():
         default=10,
         help="Minimum number of datapoints required for inclusion",
     )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=["png", "pdf", "svg"],
+        default=list(GRAPH_FORMATS),
+        help="File formats to save graphs in (e.g. --formats png to skip PDF)",
+    )
+    parser.add_argument(
+        "--cache-only",
+        action="store_true",
+        help="Only update cache of processed files, do not generate tables and graphs",
+    )
+    parser.add_argument(
+        "--from-cache",
+        action="store_true",
+        help="Use cached records only, without checking data directory for changes",
+    )
     parser.add_argument(
         "--min-articles",
         type=int,
         default=1,
         help="Minimum number of articles required per source",
-    )s
-    args = parser.parse_args()
+    )
+    return parser
+
 
-    data = load_data(args.data_dir, args.max_day, args.min_articles)
-    data["data_dir"] = args.data_dir
+def main():
+    """Command line interface for prediction analysis."""
+    args = build_parser().parse_args()
+
+    rescan = not args.from_cache
+    data = load_data(args.data_dir, args.max_day, args.min_articles, rescan)
+    if args.cache_only:
+        return
+
+    # Output directory of plots, created once for all of them
+    os.makedirs("graphs", exist_ok=True)
 
     # print_summary_stats(data, args.max_day, args.min_datapoints)
 
@@ -1136,17 +1350,23 @@ def main():
     # plot_source_comparison(data, args.max_day, args.min_articles)
     # plot_source_distribution(data)
 
-    data_day1 = load_data(args.data_dir, max_day=1, min_articles_per_source=1)
+    data_day1 = load_data(
+        args.data_dir, max_day=1, min_articles_per_source=1, rescan=rescan
+    )
     data_day1["min_datapoints"] = 100
-    data_day1["data_dir"] = args.data_dir
 
-    data_days1to3 = load_data(args.data_dir, max_day=3, min_articles_per_source=1)
+    data_days1to3 = load_data(
+        args.data_dir, max_day=3, min_articles_per_source=1, rescan=rescan
+    )
     data_days1to3["min_datapoints"] = 300
-    data_days1to3["data_dir"] = args.data_dir
 
     #plot_accuracy_over_time(data, 12, 50)
-    plot_model_comparison_combined(data_day1, data_days1to3)
-    plot_model_accuracy_over_time(data, args.max_day, args.min_datapoints)
+    plot_model_comparison_combined(data_day1, data_days1to3, formats=args.formats)
+    plot_model_accuracy_over_time(
+        data, args.max_day, args.min_datapoints, formats=args.formats
+    )
+
+    wait_for_graphs()
 
 
 if __name__ == "__main__":
@@ -32,6 +32,7 @@ MAX_TIME_OFFSET_DAYS = 7  # Random offset to avoid weekend clustering
 TOP_N_TICKERS = 100
 
 daily_mape_results = []
+price_cache = {}  # Price data of all evaluated tickers, downloaded at once in main()
 
 
 def get_top_tickers_by_frequency(db_file, limit=TOP_N_TICKERS):
@@ -68,10 +69,55 @@ def is_weekend(date_obj):
     return date_obj.weekday() >= 5
 
 
+def get_evaluation_dates(random_offset):
+    """Computes training and testing date ranges for given random offset."""
+    base_end_date = date.today() - timedelta(
+        days=TEST_DAYS_AFTER_TRAIN + DEFAULT_PREDICTION_DAYS
+    )
+    end_date = base_end_date - timedelta(days=random_offset)
+    train_end_date = end_date - timedelta(days=DEFAULT_PREDICTION_DAYS)
+    train_start_date = train_end_date - timedelta(days=TRAIN_DAYS)
+    test_start_date = train_end_date + timedelta(days=TEST_DAYS_AFTER_TRAIN)
+    test_end_date = test_start_date + timedelta(days=DEFAULT_PREDICTION_DAYS + 10)
+    return train_start_date, train_end_date, test_start_date, test_end_date
+
+
+def prefetch_price_data(tickers, start_date, end_date):
+    """Downloads price data of all tickers in a single request into price cache."""
+    try:
+        print(
+            f"Fetching data for {len(tickers)} tickers from {start_date} to {end_date}"
+        )
+        data = yf.download(
+            tickers, start=start_date, end=end_date, threads=True, progress=False
+        )
+        downloaded_tickers = set(data.columns.get_level_values("Ticker"))
+        for ticker in tickers:
+            if ticker not in downloaded_tickers:
+                continue  # Downloaded separately when evaluated
+            # Same columns as download of single ticker, without days it was not traded
+            price_cache[ticker] = data.xs(
+                ticker, axis=1, level="Ticker", drop_level=False
+            ).dropna(how="all")
+    except Exception as e:
+        print(f"Error fetching data for all tickers: {str(e)}")
+        print("Falling back to downloading data per ticker")
+
+
+def download_price_data(ticker, start_date, end_date):
+    """Gets price data of ticker from price cache, downloads it if not cached."""
+    if ticker not in price_cache:
+        return yf.download(ticker, start=start_date, end=end_date, progress=False)
+    data = price_cache[ticker]
+    return data[
+        (data.index >= pd.Timestamp(start_date)) & (data.index < pd.Timestamp(end_date))
+    ]
+
+
 def get_trading_days_from_data(ticker, start_date, end_date):
     """Get actual trading days for a ticker by fetching the data."""
     try:
-        data = yf.download(ticker, start=start_date, end=end_date, progress=False)
+        data = download_price_data(ticker, start_date, end_date)
         if data.empty:
             return []
         return [date.date() for date in data.index]
@@ -91,9 +137,7 @@ def fetch_historical_data(ticker, start_date, end_date):
     """Fetches historical stock data for given date range."""
     try:
         print(f"Fetching data for {ticker} from {start_date} to {end_date}")
-        stock_data_df = yf.download(
-            ticker, start=start_date, end=end_date, progress=False
-        )
+        stock_data_df = download_price_data(ticker, start_date, end_date)
 
         if stock_data_df.empty:
             print(
@@ -166,7 +210,8 @@ def make_predictions(model, scaler, recent_data_values):
         current_batch = scaler.transform(last_sequence).reshape((1, SEQUENCE_LENGTH, 1))
 
         for _ in range(DEFAULT_PREDICTION_DAYS):
-            predicted_price_scaled = model.predict(current_batch, verbose=0)
+            # Direct call avoids the per-call dataset and loop setup of predict()
+            predicted_price_scaled = model(current_batch, training=False).numpy()
             predicted_price = scaler.inverse_transform(predicted_price_scaled)
             predictions.append(
                 float(predicted_price[0][0])
@@ -288,14 +333,9 @@ def evaluate_ticker(ticker):
     random_offset = random.randint(0, MAX_TIME_OFFSET_DAYS)
 
     # Set up date ranges with random offset
-    base_end_date = date.today() - timedelta(
-        days=TEST_DAYS_AFTER_TRAIN + DEFAULT_PREDICTION_DAYS
+    train_start_date, train_end_date, test_start_date, test_end_date = (
+        get_evaluation_dates(random_offset)
     )
-    end_date = base_end_date - timedelta(days=random_offset)
-    train_end_date = end_date - timedelta(days=DEFAULT_PREDICTION_DAYS)
-    train_start_date = train_end_date - timedelta(days=TRAIN_DAYS)
-    test_start_date = train_end_date + timedelta(days=TEST_DAYS_AFTER_TRAIN)
-    test_end_date = test_start_date + timedelta(days=DEFAULT_PREDICTION_DAYS + 10)
 
     print(f"\n{'='*50}")
     print(f"Evaluating model for {ticker} (offset: {random_offset} days)")
@@ -357,9 +397,7 @@ def evaluate_ticker(ticker):
         return False
 
     # Fetch actual values for comparison - only for available trading days
-    actual_data_df = yf.download(
-        ticker, start=test_start_date, end=test_end_date, progress=False
-    )
+    actual_data_df = download_price_data(ticker, test_start_date, test_end_date)
     if actual_data_df.empty:
         print(
             f"No actual data found for test period {test_start_date} to {test_end_date}."
@@ -557,6 +595,11 @@ def main():
     )
     print(f"Evaluation started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
+    # Download data covering date ranges of all possible offsets at once
+    prefetch_start_date = get_evaluation_dates(MAX_TIME_OFFSET_DAYS)[0]
+    prefetch_end_date = get_evaluation_dates(0)[3]
+    prefetch_price_data(tickers, prefetch_start_date, prefetch_end_date)
+
     successful_evaluations = 0
     failed_evaluations = 0
 
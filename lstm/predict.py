@@ -98,7 +98,8 @@ def predict_future_prices(model, scaler, recent_data_values):
     last_sequence = recent_data_values[-SEQUENCE_LENGTH:]
     current_batch = scaler.transform(last_sequence).reshape((1, SEQUENCE_LENGTH, 1))
     for _ in range(DEFAULT_PREDICTION_DAYS):
-        predicted_price_scaled = model.predict(current_batch, verbose=0)
+        # Direct call avoids the per-call dataset and loop setup of predict()
+        predicted_price_scaled = model(current_batch, training=False).numpy()
         predicted_price = scaler.inverse_transform(predicted_price_scaled)
         predictions.append(predicted_price[0][0])
         current_batch = np.append(
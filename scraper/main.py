@@ -10,12 +10,15 @@ This script handles:
 """
 
 import os
+import asyncio
+import multiprocessing
+import multiprocessing.util
+import httpx
 import feedparser
 import random
 import time
 import unicodedata
 import sqlite3
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -25,10 +28,93 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from selectolax.lexbor import LexborHTMLParser
 from scraper_library import *
 
-# Initialize webdriver
-driver = getDriver()
+# Webdriver instance, started on first use during a run of main()
+driver = None
+
+# Maximum number of articles downloaded at the same time by the HTTP prefetch
+PREFETCH_CONCURRENCY = 16
+
+# Timeout (seconds) and polling interval of waiting for elements to appear in the page
+WAIT_TIMEOUT = 4
+POLL_FREQUENCY = 0.1
+
+# Maximum number of worker processes (each running its own browser) scraping with Selenium
+SCRAPER_PROCESSES = 4
+
+# Number of articles scraped by a worker between resets of its browser state
+RESET_INTERVAL = 20
+
+# Number of articles scraped by the current worker process
+scraped_count = 0
+
+
+def get_driver():
+    """
+    @brief Returns the webdriver of the current run, starting it on first use.
+
+    @return WebDriver instance
+    """
+    global driver
+    if driver is None:
+        driver = getDriver()
+    return driver
+
+
+def wait(driver, timeout=WAIT_TIMEOUT):
+    """
+    @brief Creates WebDriverWait with short polling interval.
+
+    @param driver WebDriver instance
+    @param timeout Maximum time to wait in seconds
+    @return WebDriverWait instance
+    """
+    return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY)
+
+
+async def fetch_yahoo_finance_article(client, semaphore, link):
+    """
+    @brief Downloads Yahoo Finance article and extracts its content from the served HTML.
+
+    @param client httpx.AsyncClient used for the request
+    @param semaphore asyncio.Semaphore limiting number of concurrent requests
+    @param link URL of article to fetch
+    @return Tuple of link and extracted content, content is None if the article
+            couldn't be extracted (paywall, consent page, network error, ...)
+    """
+    async with semaphore:
+        try:
+            response = await client.get(link)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return link, None
+
+    body = LexborHTMLParser(response.text).css_first("div.article-wrap div.body")
+    if body is None:
+        return link, None
+
+    content = "".join(tag.inner_html for tag in body.css("p"))
+    return link, content or None
+
+
+async def prefetch_yahoo_finance_articles(links):
+    """
+    @brief Concurrently downloads Yahoo Finance articles without a browser.
+
+    @param links List of article URLs
+    @return Dictionary mapping links to extracted content, only successfully
+            extracted articles are included
+    """
+    semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+    async with httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT}, timeout=15, follow_redirects=True
+    ) as client:
+        results = await asyncio.gather(
+            *(fetch_yahoo_finance_article(client, semaphore, link) for link in links)
+        )
+    return {link: content for link, content in results if content is not None}
 
 
 def scrape_yahoo_finance_article(link):
@@ -38,18 +124,19 @@ def scrape_yahoo_finance_article(link):
     @param link URL of article to scrape
     @return Extracted article content or error string
     """
+    driver = get_driver()
     driver.get(link)
-    random_delay()
+    human_delay()
 
     log(f"Starting scraping {link}")
     log(f"Handling cookies")
 
     try:
-        reject_button = WebDriverWait(driver, 10).until(
+        reject_button = wait(driver).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, "button.reject-all"))
         )
         random_click(reject_button, driver)
-        random_delay()
+        human_delay()
         log(f"Rejected cookies")
 
     except TimeoutException:
@@ -58,13 +145,13 @@ def scrape_yahoo_finance_article(link):
 
     log(f"Finding article")
     try:
-        main = WebDriverWait(driver, 10).until(
+        main = wait(driver).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "div.article-wrap"))
         )
         log(f"Article found")
     except TimeoutException:
         try:
-            WebDriverWait(driver, 10).until(
+            wait(driver, 2).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "div.upsell-content"))
             )
             return "ERROR-PAYWALL"
@@ -73,11 +160,11 @@ def scrape_yahoo_finance_article(link):
 
     log(f"Finding read more button")
     try:
-        read_more_button = WebDriverWait(driver, 1).until(
+        read_more_button = wait(driver, 1).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, "button.readmore-button"))
         )
         random_click(read_more_button, driver)
-        random_delay()
+        human_delay()
         log(f"Clicked read more")
 
     except TimeoutException:
@@ -85,7 +172,7 @@ def scrape_yahoo_finance_article(link):
         pass
 
     log(f"Finding body")
-    body = WebDriverWait(driver, 10).until(
+    body = wait(driver).until(
         EC.visibility_of_element_located((By.CSS_SELECTOR, "div.body"))
     )
 
@@ -100,11 +187,12 @@ def scrape_investors_article(link):
     @param link URL of article to scrape
     @return Extracted article content or error string
     """
+    driver = get_driver()
     driver.get(link)
-    random_delay()
+    human_delay()
 
     try:
-        body = WebDriverWait(driver, 10).until(
+        body = wait(driver).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "div.single-post-content"))
         )
     except TimeoutException:
@@ -112,54 +200,101 @@ def scrape_investors_article(link):
 
     text = extract_text(body)
 
-    index = text.find("YOU MAY ALSO LIKE")
+    # Recommendations footer is at the end of the article, search from the right
+    index = text.rfind("YOU MAY ALSO LIKE")
     if index != -1:
         text = text[:index]
 
     return text
 
 
-def main():
+# Scraping functions of supported sources, by domain
+SCRAPERS = {
+    "finance.yahoo.com": scrape_yahoo_finance_article,
+}
+
+# Sources which are not scraped, by domain, with the reason printed to the log
+SKIPPED_DOMAINS = {
+    # TODO: Fix investors.com scraping (scrape_investors_article)
+    "investors.com": "Investors.com scraping is broken",
+    "wsj.com": "Wallstreet Journal has scraping protection",
+    "barrons.com": "Barrons is paywalled",
+}
+
+
+def init_scraper_worker():
     """
-    @brief Main scraping workflow.
+    @brief Initializer of scraper pool worker, starts webdriver of the worker process.
 
-    Processes RSS feed, scrapes new articles, and stores them in database.
+    The driver is quit by a finalizer when the worker exits after pool.close() and pool.join().
     """
-    rss_url = "https://finance.yahoo.com/news/rssindex"
-    feed = feedparser.parse(rss_url)
+    driver = get_driver()
+    multiprocessing.util.Finalize(driver, driver.quit, exitpriority=10)
+
+
+def scrape_article(link):
+    """
+    @brief Scrapes single article with the webdriver of the current worker process.
+
+    Failure of a single page is returned as error string, an exception raised in a worker
+    would discard results of the whole pool.
+
+    @param link URL of article to scrape
+    @return Tuple of link and extracted content or error string
+    """
+    global scraped_count
+    try:
+        content = SCRAPERS[extract_domain(link)](link)
+    except Exception as e:
+        log(f"Scraping {link} failed: {e}")
+        content = "ERROR-SCRAPING-FAILED"
+
+    scraped_count += 1
+    if scraped_count % RESET_INTERVAL == 0:
+        reset_driver_state(get_driver())
+
+    return link, content
+
+
+def scrape_articles(links):
+    """
+    @brief Scrapes articles with Selenium in a pool of worker processes.
+
+    Selenium drivers can't be shared between threads, so every worker process runs its own browser.
+
+    @param links List of article URLs
+    @return Dictionary mapping links to extracted content or error string
+    """
+    if not links:
+        return {}
+
+    processes = min(SCRAPER_PROCESSES, len(links))
+    pool = multiprocessing.Pool(processes=processes, initializer=init_scraper_worker)
+    try:
+        return dict(pool.imap_unordered(scrape_article, links, chunksize=1))
+    finally:
+        # close() + join() (instead of terminate()) lets workers run finalizers quitting their drivers
+        pool.close()
+        pool.join()
 
-    result = execute_query("SELECT link FROM articles", query_type="SELECT")
-    already_scraped_links = [item["link"] for item in result]
 
+def store_articles(entries, contents, already_scraped_links):
+    """
+    @brief Validates scraped articles and stores them in database.
+
+    @param entries Feed entries of the scraped articles
+    @param contents Dictionary mapping links to extracted content or error string
+    @param already_scraped_links Set of links already in database, stored links are added to it
+    """
     new_articles = []
-    for entry in feed.entries:
+    for entry in entries:
         link = entry.link
         if link in already_scraped_links:
             continue
 
-        if "finance.yahoo.com/research/reports/" in link:
-            # Skip premium articles
-            continue
-
         print(f"Scraping {shorten_string(link)}", end="", flush=True)
 
-        domain = extract_domain(link)
-
-        if domain == "finance.yahoo.com":
-            content = scrape_yahoo_finance_article(link)
-        elif domain == "investors.com":
-            # TODO: Fix investors.com scraping
-            continue
-            content = scrape_investors_article(link)
-        elif domain == "wsj.com":
-            print(f" | FAILED, Wallstreet Journal has scraping protection")
-            continue
-        elif domain == "barrons.com":
-            print(f" | FAILED, Barrons is paywalled")
-            continue
-        else:
-            print(f" | FAILED, unknown source: {domain}")
-            continue
+        content = contents[link]
 
         if "ERROR" in content:
             if content == "ERROR-PAYWALL":
@@ -174,23 +309,104 @@ def main():
             print(f" | FAILED, article was suspiciously old")
             continue
 
-        # Store article in database
+        new_articles.append(
+            (
+                0,
+                link,
+                purify_text(entry.title),
+                entry.published,
+                entry.source.title if hasattr(entry, "source") else "Yahoo News",
+                purify_text(content),
+            )
+        )
+        already_scraped_links.add(link)
+        print(f" | SUCCESS")
+
+    # Store all new articles in database at once, a link stored meanwhile by another
+    # process would fail the whole batch, so such articles are ignored
+    if new_articles:
         insert_query = """
-            INSERT INTO articles (priority, link, title, published, source, content)
+            INSERT OR IGNORE INTO articles (priority, link, title, published, source, content)
             VALUES (?, ?, ?, ?, ?, ?)
             """
-        insert_params = (
-            0,
-            link,
-            purify_text(entry.title),
-            entry.published,
-            entry.source.title if hasattr(entry, "source") else "Yahoo News",
-            purify_text(content),
-        )
-        affected_rows = execute_query(insert_query, insert_params, query_type="INSERT")
-        print(f" | SUCCESS")
+        execute_many(insert_query, new_articles)
+
+
+def scrape_feed():
+    """
+    @brief Scraping workflow for a single pass over the RSS feed.
+
+    Processes RSS feed, scrapes new articles, and stores them in database.
+    """
+    rss_url = "https://finance.yahoo.com/news/rssindex"
+    feed = feedparser.parse(rss_url)
 
-    driver.quit()
+    # Plain tuples are enough here, set gives constant time lookups for every feed entry
+    result = execute_query(
+        "SELECT link FROM articles", query_type="SELECT", use_row_factory=False
+    )
+    already_scraped_links = {row[0] for row in result}
+
+    entries = []
+    for entry in feed.entries:
+        link = entry.link
+        if link in already_scraped_links:
+            continue
+
+        if "finance.yahoo.com/research/reports/" in link:
+            # Skip premium articles
+            continue
+
+        domain = extract_domain(link)
+
+        if domain not in SCRAPERS:
+            reason = SKIPPED_DOMAINS.get(domain, f"unknown source: {domain}")
+            print(f"Scraping {shorten_string(link)} | FAILED, {reason}")
+            continue
+
+        entries.append(entry)
+
+    # Most Yahoo Finance articles are server-rendered, download them all at once
+    # and use browsers only for those which couldn't be extracted
+    yahoo_links = [
+        entry.link
+        for entry in entries
+        if extract_domain(entry.link) == "finance.yahoo.com"
+    ]
+    contents = asyncio.run(prefetch_yahoo_finance_articles(yahoo_links))
+
+    # Prefetched articles are stored before starting the browsers, so that they are
+    # not lost if scraping with Selenium fails
+    store_articles(
+        [entry for entry in entries if entry.link in contents],
+        contents,
+        already_scraped_links,
+    )
+
+    contents = scrape_articles(
+        [entry.link for entry in entries if entry.link not in contents]
+    )
+    store_articles(
+        [entry for entry in entries if entry.link in contents],
+        contents,
+        already_scraped_links,
+    )
+
+
+def main():
+    """
+    @brief Main scraping workflow.
+
+    Scrapes the feed and always quits the webdriver afterwards (if it was needed),
+    so that main() can be called repeatedly from a long-running process.
+    """
+    global driver
+    try:
+        scrape_feed()
+    finally:
+        if driver is not None:
+            driver.quit()
+            driver = None
 
 
 if __name__ == "__main__":
@@ -10,12 +10,13 @@ This module provides common functions used across scraping scripts including:
 """
 
 import os
+import re
+import codecs
 import random
 import time
 import unicodedata
 import sqlite3
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from selectolax.lexbor import LexborHTMLParser
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
@@ -26,21 +27,47 @@ from pathlib import Path
 # Global webdriver instance
 driver = None
 
+# User agent shared by the webdriver and plain HTTP requests
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0"
+)
+
+# ASCII encoder function, drops characters which can't be encoded when used with "ignore"
+ASCII_ENCODER = codecs.getencoder("ascii")
+
+# Matches domain of http(s) URL without www prefix
+DOMAIN_PATTERN = re.compile(r"^https?://(?:www\.)?([^/:?#]+)", re.IGNORECASE)
+
+# Subresources which are never needed for extracting article text, blocked in the browser
+BLOCKED_URL_PATTERNS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*doubleclick*",
+    "*googletagmanager*",
+    "*google-analytics*",
+]
+
 
 def get_project_root():
     """
     @brief Locates the project root directory by searching for .git marker.
 
     @return Path object pointing to project root directory
-    @throws SystemExit if root directory cannot be found
+    @throws FileNotFoundError if root directory cannot be found
     """
     marker = ".git"
     current_path = Path(__file__).resolve()
     for parent in current_path.parents:
         if (parent / marker).exists():
             return parent
-    print("ERROR: Failed to find root folder of project")
-    exit(1)
+    raise FileNotFoundError("Failed to find root folder of project")
 
 
 def execute_query(
@@ -98,6 +125,31 @@ def execute_query(
         return None
 
 
+def execute_many(query, params_list, timeout=300.0):
+    """
+    @brief Executes a SQL statement for every set of parameters in a single transaction.
+
+    @param query SQL query string
+    @param params_list List of parameter tuples
+    @param timeout Database timeout in seconds
+    @return Affected rows count, None on error
+    """
+    try:
+        db_path = os.path.join(get_project_root(), "data", "news.db")
+        conn = sqlite3.connect(db_path, timeout=timeout)
+
+        with conn:
+            cursor = conn.executemany(query, params_list)
+            affected_rows = cursor.rowcount
+
+        conn.close()
+        return affected_rows
+
+    except sqlite3.Error as e:
+        print(f"An error occurred: {e}")
+        return None
+
+
 def getDriver():
     """
     @brief Initializes and returns a headless Chrome webdriver.
@@ -106,8 +158,16 @@ def getDriver():
     """
     options = webdriver.ChromeOptions()
     options.add_argument("--headless")
-    options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0"
+    # Return from driver.get() once DOM is ready, elements are awaited explicitly
+    options.page_load_strategy = "eager"
+    options.add_argument(f"user-agent={USER_AGENT}")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
     )
     try:
         driver = webdriver.Chrome(options=options)
@@ -116,9 +176,32 @@ def getDriver():
         service = webdriver.ChromeService(executable_path=chromedriver_path)
         driver = webdriver.Chrome(options=options, service=service)
 
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
     return driver
 
 
+def reset_driver_state(driver):
+    """
+    @brief Clears browser cache and page state of long-running webdriver.
+
+    Keeps memory usage of the browser bounded when many articles are scraped by the same driver.
+    Cookies are kept, so that cookie consent doesn't have to be handled again.
+
+    @param driver WebDriver instance
+    """
+    driver.get("about:blank")
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    driver.execute_cdp_cmd(
+        "Storage.clearDataForOrigin",
+        {
+            "origin": "https://finance.yahoo.com",
+            "storageTypes": "cache_storage,indexeddb,local_storage,service_workers",
+        },
+    )
+
+
 def log(text):
     """
     @brief Conditional logging function.
@@ -139,6 +222,16 @@ def random_delay(min_seconds=1, max_seconds=5):
     time.sleep(random.uniform(min_seconds, max_seconds))
 
 
+def human_delay():
+    """
+    @brief Short random delay imitating human interaction.
+
+    Disabled unless HUMAN_LIKE environment variable is set, waiting for elements is done by WebDriverWait.
+    """
+    if os.environ.get("HUMAN_LIKE"):
+        random_delay(0.1, 0.4)
+
+
 def random_click(element, driver):
     """
     @brief Performs a randomized click action on an element.
@@ -156,11 +249,16 @@ def extract_text(element):
     """
     @brief Extracts text content from HTML element.
 
+    Content of all tags is collected by a single script, instead of one WebDriver
+    command per <p> tag.
+
     @param element WebElement containing content
     @return Concatenated text from all <p> tags
     """
-    p_tags = element.find_elements(By.CSS_SELECTOR, "p")
-    return "".join(tag.get_attribute("innerHTML") for tag in p_tags)
+    return element.parent.execute_script(
+        "return Array.from(arguments[0].querySelectorAll('p'), p => p.innerHTML).join('');",
+        element,
+    )
 
 
 def purify_text(input_text):
@@ -170,11 +268,14 @@ def purify_text(input_text):
     @param input_text Raw HTML or text input
     @return Cleaned ASCII text
     """
-    soup = BeautifulSoup(input_text, "html.parser")
-    text = soup.get_text().strip()
+    # Text without tags or entities (e.g. most feed titles) doesn't need to be parsed
+    if "<" not in input_text and "&" not in input_text:
+        text = input_text.strip()
+    else:
+        text = LexborHTMLParser(input_text).body.text().strip()
 
-    normalized = unicodedata.normalize("NFKD", text)
-    ascii_text = normalized.encode("ASCII", "ignore").decode("ASCII")
+    ascii_bytes, _ = ASCII_ENCODER(unicodedata.normalize("NFKD", text), "ignore")
+    ascii_text = ascii_bytes.decode("ASCII")
 
     return ascii_text
 
@@ -199,13 +300,10 @@ def extract_domain(link):
     @brief Extracts domain name from URL.
 
     @param link Full URL
-    @return Base domain without www prefix
+    @return Base domain without www prefix, empty string for invalid URL
     """
-    parsed_url = urlparse(link)
-    netloc = parsed_url.netloc
-    if netloc.startswith("www."):
-        netloc = netloc[4:]
-    return netloc
+    match = DOMAIN_PATTERN.match(link)
+    return match.group(1) if match else ""
 
 
 def logToFile(string):
@@ -44,6 +44,22 @@ CREATE TABLE IF NOT EXISTS analysis (
 """
 )
 
+# Index for looking up analyses of an article by a model
+cursor.execute(
+    """
+CREATE INDEX IF NOT EXISTS idx_analysis_article_model
+ON analysis (article_id, model_name);
+"""
+)
+
+# Covering index for listing stocks analyzed by a model
+cursor.execute(
+    """
+CREATE INDEX IF NOT EXISTS idx_analysis_model_stock
+ON analysis (model_name, ticker, stock);
+"""
+)
+
 # Create predictions table
 cursor.execute(
     """
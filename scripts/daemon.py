@@ -4,13 +4,25 @@
 
 This script runs in a loop, periodically executing the scraper and analyzer components.
 It can be configured to run only scraping or only processing via command line arguments.
+Both components are imported once and run in-process, so interpreter startup and heavy
+library imports are not paid again on every iteration.
 """
 
-import subprocess
+import importlib.util
+import sqlite3
+import threading
 import time
 import sys
 import os
 from pathlib import Path
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+# Minutes to wait between iterations
+WAIT_MINUTES = 10
+
+# Minimum minutes between two runs of the processor woken up by new articles
+MIN_WAIT_MINUTES = 1
 
 
 def get_project_root():
@@ -29,6 +41,129 @@ def get_project_root():
     exit(1)
 
 
+def get_last_article_id(db_path):
+    """
+    @brief Gets ID of the newest article stored in the database.
+
+    Article IDs are AUTOINCREMENT, so they only grow as new articles are stored.
+
+    @param db_path Path to the SQLite database file
+    @return ID of the newest article, 0 if there are no articles or database can't be read
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=30.0)
+        return conn.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+    except sqlite3.Error as e:
+        print(f"Failed to read newest article from database: {e}")
+        return 0
+    finally:
+        if conn:
+            conn.close()
+
+
+class DatabaseChangeHandler(FileSystemEventHandler):
+    """
+    @brief Filesystem event handler which signals that the database was modified.
+    """
+
+    def __init__(self, db_path, changed_event):
+        """
+        @param db_path Path to the SQLite database file
+        @param changed_event threading.Event set on every modification of the database
+        """
+        self.db_path = str(db_path)
+        self.changed_event = changed_event
+
+    def on_modified(self, event):
+        """
+        @brief Sets the event when the database or its journal file is modified.
+
+        @param event Watchdog filesystem event
+        """
+        if event.src_path.startswith(self.db_path):
+            self.changed_event.set()
+
+
+def watch_database(db_path, changed_event):
+    """
+    @brief Starts a background observer watching the database for modifications.
+
+    @param db_path Path to the SQLite database file
+    @param changed_event threading.Event set on every modification of the database
+    @return Started watchdog Observer
+    """
+    observer = Observer()
+    observer.schedule(
+        DatabaseChangeHandler(db_path, changed_event), os.path.dirname(db_path)
+    )
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
+def wait_for_new_articles(db_path, changed_event, last_article_id, timeout):
+    """
+    @brief Waits until articles newer than the given one are stored in the database.
+
+    Other modifications of the database (analysis results, LSTM predictions, cleanup)
+    also set the event, they are checked and ignored.
+
+    @param db_path Path to the SQLite database file
+    @param changed_event threading.Event set on every modification of the database
+    @param last_article_id ID of the newest article seen by the last processing
+    @param timeout Maximum time to wait in seconds
+    @return True if new articles were stored, False if the timeout expired
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not changed_event.wait(timeout=remaining):
+            return False
+        changed_event.clear()
+        if get_last_article_id(db_path) > last_article_id:
+            return True
+
+
+def load_component(name, script_path):
+    """
+    @brief Imports a component's entry script as a module.
+
+    The script's directory is put on sys.path so its sibling imports resolve the same
+    way as when the script is run directly. The module is registered in sys.modules,
+    so that its functions can be pickled and sent to worker processes.
+
+    @param name Unique module name to register the script under
+    @param script_path Path to the component's main.py
+    @return Loaded module object
+    """
+    sys.path.insert(0, os.path.dirname(script_path))
+    spec = importlib.util.spec_from_file_location(name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_component(name, component):
+    """
+    @brief Runs main() of a component, so that its failure doesn't stop the daemon.
+
+    SystemExit is caught too, components were originally run as separate scripts and may
+    still exit on errors.
+
+    @param name Name of the component printed in log
+    @param component Module loaded by load_component()
+    """
+    print("-" * 40)
+    print(f"STARTING {name}")
+    try:
+        component.main()
+    except (Exception, SystemExit) as e:
+        print(f"{name} FAILED: {e}")
+    print(f"{name} FINISHED")
+
+
 def main():
     """
     @brief Main daemon execution loop.
@@ -49,26 +184,42 @@ def main():
     scraper_path = os.path.join(project_root_directory, "scraper", "main.py")
     analyzer_path = os.path.join(project_root_directory, "analyzer", "main.py")
 
+    if scrap:
+        scraper = load_component("scraper_main", scraper_path)
+    if process:
+        analyzer = load_component("analyzer_main", analyzer_path)
+
+    database_changed = threading.Event()
+    db_path = os.path.join(project_root_directory, "data", "news.db")
+    if not scrap:
+        # Articles are scraped by another process, so start processing as soon as
+        # it stores new articles instead of waiting for the whole interval
+        watch_database(db_path, database_changed)
+
     while True:
+        iteration_start = time.monotonic()
+
         if scrap:
-            print("-" * 40)
-            print("STARTING SCRAPER")
-            subprocess.run(["python", scraper_path])
-            print("SCRAPER FINISHED")
+            run_component("SCRAPER", scraper)
 
         if process:
+            # Articles stored while the processor runs start the next iteration
+            last_article_id = get_last_article_id(db_path)
+            run_component("PROCESSOR", analyzer)
             print("-" * 40)
-            print("STARTING PROCESSOR")
-            subprocess.run(["python", analyzer_path])
-            print("PROCESSOR FINISHED")
-            print("-" * 40)
 
-        # Wait before next iteration
-        minutes = 10
-        for i in range(0, minutes):
-            print(f"Process will run again in {minutes-i} minutes")
-            time.sleep(60)
-            i += 1
+        print(f"Process will run again in {WAIT_MINUTES} minutes")
+        if scrap:
+            time.sleep(WAIT_MINUTES * 60)
+            continue
+
+        # Wait for new articles, but don't process them more often than once
+        # per MIN_WAIT_MINUTES
+        if wait_for_new_articles(
+            db_path, database_changed, last_article_id, WAIT_MINUTES * 60
+        ):
+            next_start = iteration_start + MIN_WAIT_MINUTES * 60
+            time.sleep(max(0, next_start - time.monotonic()))
 
 
 if __name__ == "__main__":
@@ -33,7 +33,30 @@ warnings.simplefilter(action="ignore", category=FutureWarning)
 app = Flask(__name__)
 CORS(app)
 
-# gunicorn --bind 0.0.0.0:5000 website-backend/api_server:app
+# Production: gunicorn -c website-backend/gunicorn.conf.py api_server:app
+
+# Endpoints whose data only changes when the daemon writes new analyses
+CACHED_ENDPOINTS = ("/api/stocks", "/api/analysis")
+CACHE_MAX_AGE = 60
+
+
+@app.after_request
+def add_cache_headers(response):
+    """@brief Adds ETag and Cache-Control headers to responses of cached endpoints
+
+    @details ETag is a hash of the response body, so clients sending a matching
+    If-None-Match header get an empty 304 response instead of the full JSON.
+
+    @param response Response object created by the endpoint
+    @return Response object, possibly converted to 304 Not Modified
+    """
+    if request.path not in CACHED_ENDPOINTS or response.status_code != 200:
+        return response
+
+    response.add_etag()
+    response.cache_control.public = True
+    response.cache_control.max_age = CACHE_MAX_AGE
+    return response.make_conditional(request)
 
 
 def get_project_root():
@@ -428,6 +451,7 @@ def get_stocks():
             WHERE an.model_name = ?
             GROUP BY an.ticker
             HAVING COUNT(an.ticker) >= ?
+            ORDER BY an.ticker
             """,
             (model, int(min_articles)),
         )
@@ -438,17 +462,8 @@ def get_stocks():
         if len(rows) < 1:
             return jsonify({"message": "No stocks found with the given criteria"}), 200
 
-        unique_tickers = set()
-        stocks = []
-
-        for row in rows:
-            ticker = row["ticker"]
-            if ticker not in unique_tickers:
-                unique_tickers.add(ticker)
-                stocks.append(f"{ticker} ({row['stock']})")
-
-        # Sort alphabetically
-        stocks.sort()
+        # Rows are already unique per ticker and sorted by the query
+        stocks = [f"{row['ticker']} ({row['stock']})" for row in rows]
 
         return jsonify(stocks)
 
@@ -537,4 +552,6 @@ def get_results():
 
 
 if __name__ == "__main__":
+    # Werkzeug development server, handles requests one at a time,
+    # use gunicorn (see gunicorn.conf.py) for deployment
     app.run(host="0.0.0.0", port=5000, debug=False)
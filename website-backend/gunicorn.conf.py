@@ -0,0 +1,21 @@
+"""@package website-backend.gunicorn.conf
+@brief Gunicorn configuration for the production API server
+
+Usage (from project root):
+    gunicorn -c website-backend/gunicorn.conf.py api_server:app
+"""
+
+import os
+
+# Directory containing api_server.py, so the app module can be imported by name
+chdir = os.path.dirname(os.path.abspath(__file__))
+
+bind = "0.0.0.0:5000"
+
+# Every request opens its own SQLite connection, threads mostly wait on
+# database reads and upstream APIs, so gthread workers scale well here
+workers = 4
+worker_class = "gthread"
+threads = 8
+
+timeout = 120